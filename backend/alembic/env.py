@@ -6,6 +6,7 @@ from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.models.call import Base
+from app.models import analysis_cache, data_version, recording_job, rollup, symptom  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
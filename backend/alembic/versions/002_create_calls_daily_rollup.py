@@ -0,0 +1,44 @@
+"""create calls_daily_rollup table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calls_daily_rollup",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("urgency", sa.String(10), primary_key=True),
+        sa.Column("status", sa.String(10), primary_key=True),
+        sa.Column("call_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("duration_seconds", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        r"""
+        INSERT INTO calls_daily_rollup (day, urgency, status, call_count, duration_seconds)
+        SELECT (time AT TIME ZONE 'UTC')::date, urgency, status, count(*),
+               sum(CASE WHEN duration ~ '^\d+:\d+:\d+$'
+                        THEN split_part(duration, ':', 1)::int * 3600
+                           + split_part(duration, ':', 2)::int * 60
+                           + split_part(duration, ':', 3)::int
+                        ELSE 0 END)
+        FROM calls
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("calls_daily_rollup")
@@ -0,0 +1,68 @@
+"""create symptom dictionary and counters
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "symptoms",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("key", sa.String(255), nullable=False, unique=True),
+        sa.Column("label", sa.String(255), nullable=False),
+        sa.Column("call_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_symptoms_call_count_desc", "symptoms", [sa.text("call_count DESC")])
+    op.create_table(
+        "symptom_daily_counts",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column(
+            "symptom_id", sa.Integer(),
+            sa.ForeignKey("symptoms.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("call_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # Backfill; scripts/rebuild_symptoms.py recomputes with the exact Python normalization
+    op.execute(
+        r"""
+        CREATE TEMPORARY TABLE call_symptoms ON COMMIT DROP AS
+        SELECT DISTINCT c.id AS call_id,
+               (c.time AT TIME ZONE 'UTC')::date AS day,
+               rtrim(left(lower(rtrim(left(regexp_replace(btrim(s), '\s+', ' ', 'g'), 255))), 255)) AS key,
+               rtrim(left(regexp_replace(btrim(s), '\s+', ' ', 'g'), 255)) AS label
+        FROM calls c, unnest(c.symptoms) AS s
+        WHERE btrim(s) <> ''
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO symptoms (key, label, call_count)
+        SELECT key, min(label), count(DISTINCT call_id) FROM call_symptoms GROUP BY key
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO symptom_daily_counts (day, symptom_id, call_count)
+        SELECT cs.day, s.id, count(DISTINCT cs.call_id)
+        FROM call_symptoms cs JOIN symptoms s ON s.key = cs.key
+        GROUP BY cs.day, s.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("symptom_daily_counts")
+    op.drop_table("symptoms")
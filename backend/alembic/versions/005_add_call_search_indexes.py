@@ -0,0 +1,49 @@
+"""add trigram and full-text search indexes to calls
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_calls_name_trgm ON calls USING gin (name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_calls_phone_trgm ON calls USING gin (phone gin_trgm_ops)")
+
+    # array_to_string() is only STABLE, which generated columns do not accept
+    op.execute(
+        """
+        CREATE FUNCTION medicall_array_to_text(text[]) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT array_to_string($1, ' ') $$
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE calls ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('german', coalesce(summary, '')), 'A')
+            || setweight(to_tsvector('german', medicall_array_to_text(symptoms)), 'A')
+            || setweight(to_tsvector('german', coalesce(notes, '')), 'B')
+            || setweight(to_tsvector('german', coalesce(transcript, '')), 'C')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX ix_calls_search_vector ON calls USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX ix_calls_search_vector")
+    op.execute("ALTER TABLE calls DROP COLUMN search_vector")
+    op.execute("DROP FUNCTION medicall_array_to_text(text[])")
+    op.execute("DROP INDEX ix_calls_phone_trgm")
+    op.execute("DROP INDEX ix_calls_name_trgm")
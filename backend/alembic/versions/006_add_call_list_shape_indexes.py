@@ -0,0 +1,59 @@
+"""replace single-column call indexes with list-shape composites
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sorts (tie-broken by id for keyset pagination)
+    op.create_index("ix_calls_time_id", "calls", [sa.text("time DESC"), sa.text("id DESC")])
+    op.create_index("ix_calls_created_at_id", "calls", [sa.text("created_at DESC"), sa.text("id DESC")])
+    op.create_index("ix_calls_updated_at_id", "calls", [sa.text("updated_at DESC"), sa.text("id DESC")])
+    op.create_index("ix_calls_name_id", "calls", ["name", "id"])
+    op.create_index("ix_calls_urgency_id", "calls", ["urgency", "id"])
+
+    # Filters combined with the default time sort
+    op.create_index(
+        "ix_calls_status_time_id", "calls", ["status", sa.text("time DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_calls_urgency_time_id", "calls", ["urgency", sa.text("time DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_calls_unread_urgency_time_id", "calls",
+        ["urgency", sa.text("time DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("status = 'unread'"),
+    )
+
+    op.drop_index("ix_calls_status", "calls")
+    op.drop_index("ix_calls_urgency", "calls")
+    op.drop_index("ix_calls_time_desc", "calls")
+    op.drop_index("ix_calls_created_at_desc", "calls")
+
+
+def downgrade() -> None:
+    op.create_index("ix_calls_status", "calls", ["status"])
+    op.create_index("ix_calls_urgency", "calls", ["urgency"])
+    op.create_index("ix_calls_time_desc", "calls", [sa.text("time DESC")])
+    op.create_index("ix_calls_created_at_desc", "calls", [sa.text("created_at DESC")])
+
+    op.drop_index("ix_calls_unread_urgency_time_id", "calls")
+    op.drop_index("ix_calls_urgency_time_id", "calls")
+    op.drop_index("ix_calls_status_time_id", "calls")
+    op.drop_index("ix_calls_urgency_id", "calls")
+    op.drop_index("ix_calls_name_id", "calls")
+    op.drop_index("ix_calls_updated_at_id", "calls")
+    op.drop_index("ix_calls_created_at_id", "calls")
+    op.drop_index("ix_calls_time_id", "calls")
@@ -0,0 +1,50 @@
+"""create recording_jobs queue table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recording_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "call_id", sa.Integer(),
+            sa.ForeignKey("calls.id", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column("recording_url", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now(),
+        ),
+        sa.Column("locked_by", sa.String(100), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_recording_jobs_claimable", "recording_jobs", ["available_at", "id"],
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+    op.create_index("ix_recording_jobs_call_id", "recording_jobs", ["call_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("recording_jobs")
@@ -0,0 +1,53 @@
+"""unique twilio_call_sid and analysis_cache table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Webhook retries already stored: keep the sid on the first row only, so the
+    # index can be built without deleting calls staff may have annotated
+    op.execute(
+        """
+        UPDATE calls SET twilio_call_sid = NULL
+        WHERE twilio_call_sid = ''
+           OR id IN (
+               SELECT id FROM (
+                   SELECT id, row_number() OVER (PARTITION BY twilio_call_sid ORDER BY id) AS n
+                   FROM calls WHERE twilio_call_sid IS NOT NULL
+               ) ranked WHERE n > 1
+           )
+        """
+    )
+    op.create_index(
+        "ux_calls_twilio_call_sid", "calls", ["twilio_call_sid"], unique=True,
+        postgresql_where=sa.text("twilio_call_sid IS NOT NULL"),
+    )
+
+    op.create_table(
+        "analysis_cache",
+        sa.Column("kind", sa.String(20), primary_key=True),
+        sa.Column("key_hash", sa.String(64), primary_key=True),
+        sa.Column("value", postgresql.JSONB(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analysis_cache")
+    op.drop_index("ux_calls_twilio_call_sid", "calls")
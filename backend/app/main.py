@@ -1,10 +1,58 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.routers import calls, stats, twilio_webhook
+from app.database import async_session
+from app.middleware import MetricsMiddleware, ProfilerMiddleware, ServerTimingMiddleware
+from app.routers import calls, events, metrics, stats, twilio_webhook
+from app.services import (
+    cache_service,
+    clients,
+    event_service,
+    ingest_service,
+    job_service,
+    notify_service,
+    recording_service,
+    report_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _load_data_version() -> None:
+    try:
+        async with async_session() as db:
+            await cache_service.load_version(db)
+    except Exception:
+        logger.exception("Could not load data version; caches start cold")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await _load_data_version()
+    if settings.pg_notify_enabled:
+        notify_service.listen(cache_service.DATA_VERSION_CHANNEL, cache_service.observe_notification)
+        notify_service.listen(event_service.CALL_EVENTS_CHANNEL, event_service.dispatch_notification)
+        notify_service.listen(job_service.JOBS_CHANNEL, lambda _payload: job_service.wake())
+        notify_service.on_connect(_load_data_version)
+        notify_service.on_connect(event_service.resync)
+        await notify_service.start()
+    clients.start()
+    recording_service.start(settings.recording_workers)
+    ingest_service.start(settings.ingest_flushers)
+    yield
+    await ingest_service.stop()
+    await recording_service.stop()
+    event_service.close()
+    report_service.shutdown()
+    await notify_service.stop()
+    await clients.close()
+
 
-app = FastAPI(title="MediCall-AI", version="1.0.0")
+app = FastAPI(title="MediCall-AI", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,11 +60,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+if settings.profiling_enabled:
+    app.add_middleware(ProfilerMiddleware)
 
 app.include_router(calls.router, prefix="/api")
 app.include_router(stats.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
 app.include_router(twilio_webhook.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 
 @app.get("/api/health")
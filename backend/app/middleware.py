@@ -0,0 +1,109 @@
+import time
+
+from pyinstrument import Profiler
+from starlette.datastructures import MutableHeaders, QueryParams
+from starlette.responses import HTMLResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.services import metrics_service
+from app.utils import sql_timing
+
+
+class MetricsMiddleware:
+    """Record per-route HTTP latency until the response headers are sent.
+
+    Pure ASGI rather than ``BaseHTTPMiddleware``, so streamed responses (SSE,
+    exports) pass through untouched. Requests that match no route are
+    labelled "unmatched" to keep the label set bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        observed = False
+
+        def observe(status: int) -> None:
+            nonlocal observed
+            observed = True
+            route = scope.get("route")
+            metrics_service.HTTP_REQUEST_SECONDS.labels(
+                scope["method"], route.path if route else "unmatched", str(status),
+            ).observe(time.perf_counter() - started)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if not observed:
+                observe(500)
+            raise
+
+
+class ServerTimingMiddleware:
+    """Report the request's SQL query count and DB time in ``Server-Timing``.
+
+    ``db`` is the summed time of every statement up to the response headers
+    (concurrent queries add up), ``app`` the whole handler time; browser dev
+    tools show both in the request's timing tab.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with sql_timing.track() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    db_ms = stats.seconds * 1000
+                    app_ms = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={app_ms:.1f}',
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+class ProfilerMiddleware:
+    """With ``?profile=1``, answer with a pyinstrument report of the request.
+
+    The request runs normally but its response is discarded. Only installed
+    when ``profiling_enabled`` is set; never enable it in production.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or QueryParams(scope["query_string"]).get("profile") != "1":
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message: Message) -> None:
+            pass
+
+        profiler = Profiler(interval=settings.profiling_interval_seconds, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+        await HTMLResponse(profiler.output_html())(scope, receive, send)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.call import Base
+
+
+class AnalysisCacheEntry(Base):
+    """Model output keyed by a hash of everything that determined it.
+
+    ``kind`` is "transcript" (audio + transcription settings) or "analysis"
+    (model + prompt + transcript); ``value`` is the JSON result.
+    """
+
+    __tablename__ = "analysis_cache"
+
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)
+    key_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[Any] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
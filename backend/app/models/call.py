@@ -1,7 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Boolean, Computed, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -34,10 +34,37 @@ class Call(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('german', coalesce(summary, '')), 'A') "
+            "|| setweight(to_tsvector('german', medicall_array_to_text(symptoms)), 'A') "
+            "|| setweight(to_tsvector('german', coalesce(notes, '')), 'B') "
+            "|| setweight(to_tsvector('german', coalesce(transcript, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     __table_args__ = (
-        Index("ix_calls_status", "status"),
-        Index("ix_calls_urgency", "urgency"),
-        Index("ix_calls_time_desc", time.desc()),
-        Index("ix_calls_created_at_desc", created_at.desc()),
+        # List shapes, see call_service.SORT_COLUMNS
+        Index("ix_calls_time_id", time.desc(), id.desc()),
+        Index("ix_calls_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_calls_updated_at_id", updated_at.desc(), id.desc()),
+        Index("ix_calls_name_id", name, id),
+        Index("ix_calls_urgency_id", urgency, id),
+        Index("ix_calls_status_time_id", status, time.desc(), id.desc()),
+        Index("ix_calls_urgency_time_id", urgency, time.desc(), id.desc()),
+        Index(
+            "ix_calls_unread_urgency_time_id", urgency, time.desc(), id.desc(),
+            postgresql_where=status == "unread",
+        ),
+        Index("ix_calls_name_trgm", name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_calls_phone_trgm", phone, postgresql_using="gin", postgresql_ops={"phone": "gin_trgm_ops"}),
+        Index("ix_calls_search_vector", search_vector, postgresql_using="gin"),
+        # Twilio retries webhooks; ingestion upserts on this
+        Index(
+            "ux_calls_twilio_call_sid", twilio_call_sid, unique=True,
+            postgresql_where=twilio_call_sid.isnot(None),
+        ),
     )
@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, CheckConstraint, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.call import Base
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by every write transaction on calls.
+
+    The row lock orders bumps by commit, so a higher version always means
+    strictly newer data, across workers and restarts.
+    """
+
+    __tablename__ = "data_version"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+    __table_args__ = (CheckConstraint("id = 1", name="ck_data_version_single_row"),)
@@ -0,0 +1,18 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.call import Base
+
+
+class CallDailyRollup(Base):
+    """Per-day call counters, kept current by the write paths in call_service."""
+
+    __tablename__ = "calls_daily_rollup"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    urgency: Mapped[str] = mapped_column(String(10), primary_key=True)
+    status: Mapped[str] = mapped_column(String(10), primary_key=True)
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    duration_seconds: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
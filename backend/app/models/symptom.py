@@ -0,0 +1,33 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.call import Base
+
+
+class Symptom(Base):
+    """Normalized symptom dictionary with an all-time call counter."""
+
+    __tablename__ = "symptoms"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    key: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    label: Mapped[str] = mapped_column(String(255), nullable=False)
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    __table_args__ = (
+        Index("ix_symptoms_call_count_desc", call_count.desc()),
+    )
+
+
+class SymptomDailyCount(Base):
+    """Calls mentioning a symptom per UTC day, for date-range top-N queries."""
+
+    __tablename__ = "symptom_daily_counts"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    symptom_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("symptoms.id", ondelete="CASCADE"), primary_key=True
+    )
+    call_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
@@ -1,15 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.call import CallOut, CallsListResponse, NotesUpdate
-from app.services import call_service
+from app.schemas.call import (
+    BulkCallsUpdate,
+    BulkResult,
+    BulkSelection,
+    CallListItem,
+    CallOut,
+    CallsListResponse,
+    NotesUpdate,
+)
+from app.services import cache_service, call_service, export_service
 from app.utils.deps import get_db
+from app.utils.etag import collection_etag, if_match_versions, not_modified, row_etag
 
 router = APIRouter(tags=["calls"])
 
 
-@router.get("/calls", response_model=CallsListResponse)
+def _parse_fields(fields: str | None, default=call_service.LIST_FIELDS) -> tuple[str, ...]:
+    if not fields:
+        return default
+    return tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+
+
+def _list_items(rows, fields: tuple[str, ...]) -> list[CallListItem]:
+    # Rows come straight from the database, so skip a second validation pass
+    keys = ("id", *fields)
+    return [CallListItem.model_construct(**{k: row[k] for k in keys}) for row in rows]
+
+
+def _expected(request: Request, call_id: int):
+    header = request.headers.get("if-match")
+    return None if header is None else if_match_versions(header, call_id)
+
+
+async def _not_updated(db: AsyncSession, call_id: int, expected) -> HTTPException:
+    if expected is not None and await call_service.get_call_updated_at(db, call_id) is not None:
+        return HTTPException(status_code=412, detail="Call was modified, reload and retry")
+    return HTTPException(status_code=404, detail="Call not found")
+
+
+def _updated(response: Response, call) -> CallOut:
+    response.headers["ETag"] = row_etag(call.id, call.updated_at)
+    return CallOut.model_validate(call)
+
+
+@router.get("/calls", response_model=CallsListResponse, response_model_exclude_unset=True)
 async def list_calls(
+    request: Request,
+    response: Response,
     search: str | None = None,
     status: str | None = None,
     urgency: str | None = None,
@@ -17,58 +60,137 @@ async def list_calls(
     limit: int = 10,
     sort: str | None = None,
     order: str = "desc",
+    cursor: str | None = None,
+    search_mode: Literal["basic", "fulltext"] = "basic",
+    count: Literal["exact", "estimate", "none"] = "exact",
+    fields: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    calls, total = await call_service.get_calls(
-        db, search=search, status=status, urgency=urgency,
-        skip=skip, limit=limit, sort=sort, order=order,
-    )
+    version = await cache_service.validated_version(db)
+    not_modified(request, response, collection_etag(request, version))
+    selected = _parse_fields(fields)
+    try:
+        page = await call_service.get_calls(
+            db, search=search, status=status, urgency=urgency,
+            skip=skip, limit=limit, sort=sort, order=order, cursor=cursor,
+            search_mode=search_mode, count_mode=count, fields=selected,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     return CallsListResponse(
-        calls=[CallOut.model_validate(c) for c in calls],
-        total=total, skip=skip, limit=limit,
+        calls=_list_items(page.calls, selected),
+        total=page.total, skip=skip, limit=limit,
+        next_cursor=page.next_cursor, has_more=page.has_more,
+    )
+
+
+def _selection(body: BulkSelection) -> list:
+    if body.ids is not None:
+        return call_service.selection(ids=body.ids)
+    return call_service.selection(**body.filter.model_dump())
+
+
+@router.patch("/calls/bulk", response_model=BulkResult)
+async def bulk_update_calls(body: BulkCallsUpdate, db: AsyncSession = Depends(get_db)):
+    where = _selection(body)
+    if body.action == "complete_callback":
+        ids = await call_service.complete_callbacks(db, where)
+    else:
+        ids = await call_service.set_status(db, where, body.action.removeprefix("mark_"))
+    return BulkResult(count=len(ids), ids=ids)
+
+
+@router.delete("/calls/bulk", response_model=BulkResult)
+async def bulk_delete_calls(body: BulkSelection, db: AsyncSession = Depends(get_db)):
+    ids = await call_service.delete_calls(db, _selection(body))
+    return BulkResult(count=len(ids), ids=ids)
+
+
+@router.get("/calls/export")
+async def export_calls(
+    format: Literal["csv", "ndjson"] = "csv",
+    search: str | None = None,
+    status: str | None = None,
+    urgency: str | None = None,
+    sort: str | None = None,
+    order: str = "desc",
+    search_mode: Literal["basic", "fulltext"] = "basic",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    fields: str | None = None,
+):
+    """Every matching call, streamed; takes the same filters as GET /calls."""
+    selected = _parse_fields(fields, call_service.EXPORT_FIELDS)
+    try:
+        query = call_service.export_query(
+            search=search, status=status, urgency=urgency, sort=sort, order=order,
+            search_mode=search_mode, date_from=date_from, date_to=date_to, fields=selected,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    filename = f"medicall-calls-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        export_service.stream(query, selected, format),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
 @router.get("/calls/{call_id}", response_model=CallOut)
-async def get_call(call_id: int, db: AsyncSession = Depends(get_db)):
+async def get_call(
+    call_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db),
+):
+    if request.headers.get("if-none-match"):
+        # Revalidate against updated_at alone before loading the row
+        updated_at = await call_service.get_call_updated_at(db, call_id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Call not found")
+        not_modified(request, response, row_etag(call_id, updated_at))
     call = await call_service.get_call(db, call_id)
     if not call:
         raise HTTPException(status_code=404, detail="Call not found")
+    not_modified(request, response, row_etag(call.id, call.updated_at))
     return CallOut.model_validate(call)
 
 
 @router.patch("/calls/{call_id}/status", response_model=CallOut)
-async def toggle_call_status(call_id: int, db: AsyncSession = Depends(get_db)):
-    call = await call_service.get_call(db, call_id)
+async def toggle_call_status(
+    call_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db),
+):
+    expected = _expected(request, call_id)
+    call = await call_service.toggle_status(db, call_id, expected=expected)
     if not call:
-        raise HTTPException(status_code=404, detail="Call not found")
-    call = await call_service.toggle_status(db, call)
-    return CallOut.model_validate(call)
+        raise await _not_updated(db, call_id, expected)
+    return _updated(response, call)
 
 
 @router.patch("/calls/{call_id}/notes", response_model=CallOut)
 async def update_call_notes(
-    call_id: int, body: NotesUpdate, db: AsyncSession = Depends(get_db),
+    call_id: int,
+    body: NotesUpdate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
 ):
-    call = await call_service.get_call(db, call_id)
+    expected = _expected(request, call_id)
+    call = await call_service.update_notes(db, call_id, body.notes, expected=expected)
     if not call:
-        raise HTTPException(status_code=404, detail="Call not found")
-    call = await call_service.update_notes(db, call, body.notes)
-    return CallOut.model_validate(call)
+        raise await _not_updated(db, call_id, expected)
+    return _updated(response, call)
 
 
 @router.patch("/calls/{call_id}/callback", response_model=CallOut)
-async def mark_callback(call_id: int, db: AsyncSession = Depends(get_db)):
-    call = await call_service.get_call(db, call_id)
+async def mark_callback(
+    call_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_db),
+):
+    expected = _expected(request, call_id)
+    call = await call_service.mark_callback_completed(db, call_id, expected=expected)
     if not call:
-        raise HTTPException(status_code=404, detail="Call not found")
-    call = await call_service.mark_callback_completed(db, call)
-    return CallOut.model_validate(call)
+        raise await _not_updated(db, call_id, expected)
+    return _updated(response, call)
 
 
 @router.delete("/calls/{call_id}", status_code=204)
 async def delete_call(call_id: int, db: AsyncSession = Depends(get_db)):
-    call = await call_service.get_call(db, call_id)
-    if not call:
+    if not await call_service.delete_call(db, call_id):
         raise HTTPException(status_code=404, detail="Call not found")
-    await call_service.delete_call(db, call)
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.services import event_service
+
+router = APIRouter(tags=["events"])
+
+
+def _frame(event: dict) -> str:
+    lines = [f"event: {event['type']}", f"data: {json.dumps(event)}"]
+    if event.get("version") is not None:
+        lines.insert(0, f"id: {event['version']}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _stream(sub: event_service.Subscription):
+    try:
+        yield f"retry: {settings.sse_retry_ms}\n\n"
+        while True:
+            try:
+                event = await sub.get(settings.sse_keepalive_seconds)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield _frame(event)
+    finally:
+        event_service.unsubscribe(sub)
+
+
+@router.get("/events")
+async def call_events():
+    """Server-Sent Events: call.created, call.updated, call.deleted and resync.
+
+    ``resync`` (or an event with ``ids: null``) means the client missed
+    events and should refetch what it shows.
+    """
+    sub = event_service.subscribe()
+    return StreamingResponse(
+        _stream(sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,15 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import metrics_service
+from app.utils.deps import get_db
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(db: AsyncSession = Depends(get_db)):
+    return Response(await metrics_service.render(db), media_type=metrics_service.CONTENT_TYPE)
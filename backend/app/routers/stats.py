@@ -1,44 +1,202 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import Response
-from sqlalchemy import select
+import asyncio
+import os
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.call import Call
-from app.schemas.stats import DailyStatsOut, StatsOut, SymptomStatOut, UrgencyStatsOut
-from app.services import pdf_service, stats_service
-from app.utils.deps import get_db
+from app.schemas.call import CallListItem, CallsListResponse
+from app.schemas.stats import (
+    CacheStatsOut,
+    DailyStatsOut,
+    DashboardOut,
+    ReportJobOut,
+    StatsOut,
+    SymptomStatOut,
+    UrgencyStatsOut,
+)
+from app.services import cache_service, call_service, report_service, stats_service
+from app.services.cache_service import stats_cache
+from app.utils.deps import get_db, run_in_session
+from app.utils.etag import collection_etag, not_modified
 
 router = APIRouter(tags=["stats"])
 
 
+async def _revalidate(request: Request, response: Response, db: AsyncSession) -> None:
+    version = await cache_service.validated_version(db)
+    # "today" and "last N days" roll over at midnight without any write
+    not_modified(request, response, collection_etag(request, version, stats_service.utc_today()))
+
+
 @router.get("/stats", response_model=StatsOut)
-async def get_stats(db: AsyncSession = Depends(get_db)):
-    return await stats_service.get_stats(db)
+async def get_stats(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    await _revalidate(request, response, db)
+    return await stats_cache.get_or_compute(
+        ("stats", stats_service.utc_today()), lambda: stats_service.get_stats(db),
+    )
 
 
 @router.get("/stats/daily", response_model=list[DailyStatsOut])
-async def get_daily_stats(days: int = 7, db: AsyncSession = Depends(get_db)):
-    return await stats_service.get_daily_stats(db, days=days)
+async def get_daily_stats(
+    request: Request, response: Response, days: int = 7, db: AsyncSession = Depends(get_db),
+):
+    await _revalidate(request, response, db)
+    return await stats_cache.get_or_compute(
+        ("daily", days, stats_service.utc_today()),
+        lambda: stats_service.get_daily_stats(db, days=days),
+    )
 
 
 @router.get("/stats/urgency", response_model=list[UrgencyStatsOut])
-async def get_urgency_stats(db: AsyncSession = Depends(get_db)):
-    return await stats_service.get_urgency_stats(db)
+async def get_urgency_stats(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db),
+):
+    await _revalidate(request, response, db)
+    return await stats_cache.get_or_compute(
+        ("urgency",), lambda: stats_service.get_urgency_stats(db),
+    )
 
 
 @router.get("/stats/symptoms", response_model=list[SymptomStatOut])
-async def get_symptom_stats(limit: int = 10, db: AsyncSession = Depends(get_db)):
-    return await stats_service.get_symptom_stats(db, limit=limit)
+async def get_symptom_stats(
+    request: Request,
+    response: Response,
+    limit: int = 10,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    await _revalidate(request, response, db)
+    return await stats_cache.get_or_compute(
+        ("symptoms", limit, date_from, date_to),
+        lambda: stats_service.get_symptom_stats(
+            db, limit=limit, date_from=date_from, date_to=date_to,
+        ),
+    )
 
 
-@router.get("/stats/export/pdf")
-async def export_pdf(db: AsyncSession = Depends(get_db)):
-    stats = await stats_service.get_stats(db)
-    result = await db.execute(select(Call).order_by(Call.time.desc()).limit(50))
-    calls = list(result.scalars().all())
-    pdf_bytes = pdf_service.generate_report_pdf(calls, stats)
+@router.get("/stats/dashboard", response_model=DashboardOut, response_model_exclude_unset=True)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    days: int = 7,
+    symptoms_limit: int = 10,
+    calls_limit: int = 5,
+):
+    """Everything the dashboard renders, with each query on its own pooled connection."""
+    version = await run_in_session(cache_service.validated_version)
+    today = stats_service.utc_today()
+    not_modified(request, response, collection_etag(request, version, today))
+    stats, daily, urgency, symptoms, page = await asyncio.gather(
+        stats_cache.get_or_compute(("stats", today), lambda: run_in_session(stats_service.get_stats)),
+        stats_cache.get_or_compute(
+            ("daily", days, today), lambda: run_in_session(stats_service.get_daily_stats, days=days),
+        ),
+        stats_cache.get_or_compute(
+            ("urgency",), lambda: run_in_session(stats_service.get_urgency_stats),
+        ),
+        stats_cache.get_or_compute(
+            ("symptoms", symptoms_limit, None, None),
+            lambda: run_in_session(stats_service.get_symptom_stats, limit=symptoms_limit),
+        ),
+        run_in_session(call_service.get_calls, limit=calls_limit, count_mode="estimate"),
+    )
+    return DashboardOut(
+        stats=stats,
+        daily=daily,
+        urgency=urgency,
+        symptoms=symptoms,
+        calls=CallsListResponse(
+            calls=[CallListItem.model_construct(**row) for row in page.calls],
+            total=page.total, skip=0, limit=calls_limit,
+            next_cursor=page.next_cursor, has_more=page.has_more,
+        ),
+    )
+
+
+@router.get("/stats/cache", response_model=CacheStatsOut)
+async def get_cache_stats():
+    return stats_cache.stats()
+
+
+def _pdf_response(pdf: bytes, filename: str) -> Response:
     return Response(
-        content=pdf_bytes,
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+def _range(date_from: date | None, date_to: date | None) -> tuple[date, date] | None:
+    if date_from is None and date_to is None:
+        return None
+    date_from, date_to = date_from or date_to, date_to or date_from
+    try:
+        report_service.validate_range(date_from, date_to)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return date_from, date_to
+
+
+@router.get("/stats/export/pdf")
+async def export_pdf(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Synchronous variant of the report job API; still renders off the event loop.
+
+    Without a range this is today's report; with ``date_from``/``date_to`` it
+    lists every call in those UTC days.
+    """
+    span = _range(date_from, date_to)
+    if span is None:
+        return _pdf_response(await report_service.render_daily(db), "medicall-report.pdf")
+    path = await report_service.render_range(*span)
+    return FileResponse(
+        path,
         media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=medicall-report.pdf"},
+        filename=report_service.range_filename(*span),
+        background=BackgroundTask(os.unlink, path),
     )
+
+
+@router.post("/stats/reports", response_model=ReportJobOut, status_code=202)
+async def submit_report(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    span = _range(date_from, date_to)
+    if span is None:
+        job = await report_service.submit_daily(db)
+    else:
+        job = await report_service.submit_range(db, *span)
+    return ReportJobOut.model_validate(job)
+
+
+def _job(job_id: str) -> report_service.ReportJob:
+    job = report_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+@router.get("/stats/reports/{job_id}", response_model=ReportJobOut)
+async def get_report(job_id: str):
+    return ReportJobOut.model_validate(_job(job_id))
+
+
+@router.get("/stats/reports/{job_id}/pdf")
+async def download_report(job_id: str):
+    job = _job(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Report failed: {job.error}")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail="Report is not ready yet")
+    if job.path is not None:
+        return FileResponse(job.path, media_type="application/pdf", filename=job.filename)
+    return _pdf_response(job.pdf, job.filename)
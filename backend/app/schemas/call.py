@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class CallOut(BaseModel):
@@ -23,12 +24,69 @@ class CallOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class CallListItem(BaseModel):
+    """Row of GET /api/calls; only the requested ``fields`` are serialized."""
+
+    id: int
+    name: str | None = None
+    phone: str | None = None
+    urgency: str | None = None
+    time: datetime | None = None
+    duration: str | None = None
+    summary: str | None = None
+    status: str | None = None
+    symptoms: list[str] | None = None
+    callback_requested: bool | None = None
+    callback_completed: bool | None = None
+    callback_completed_at: datetime | None = None
+    notes: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
 class CallsListResponse(BaseModel):
-    calls: list[CallOut]
-    total: int
+    calls: list[CallListItem]
+    total: int | None
     skip: int
     limit: int
+    next_cursor: str | None = None
+    has_more: bool = False
 
 
 class NotesUpdate(BaseModel):
     notes: str
+
+
+class CallFilter(BaseModel):
+    """Same filters as GET /api/calls."""
+
+    search: str | None = None
+    status: str | None = None
+    urgency: str | None = None
+    search_mode: Literal["basic", "fulltext"] = "basic"
+
+
+class BulkSelection(BaseModel):
+    """Either explicit ``ids`` or a non-empty ``filter``, never both."""
+
+    ids: list[int] | None = Field(default=None, min_length=1, max_length=1000)
+    filter: CallFilter | None = None
+
+    @model_validator(mode="after")
+    def _one_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        if self.filter is not None and not (
+            self.filter.search or self.filter.status or self.filter.urgency
+        ):
+            raise ValueError("'filter' needs at least one of search, status, urgency")
+        return self
+
+
+class BulkCallsUpdate(BulkSelection):
+    action: Literal["mark_read", "mark_unread", "complete_callback"]
+
+
+class BulkResult(BaseModel):
+    count: int
+    ids: list[int]
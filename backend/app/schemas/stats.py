@@ -1,5 +1,9 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
+from app.schemas.call import CallsListResponse
+
 
 class StatsOut(BaseModel):
     today_calls: int
@@ -26,3 +30,31 @@ class UrgencyStatsOut(BaseModel):
 class SymptomStatOut(BaseModel):
     symptom: str
     count: int
+
+
+class CacheStatsOut(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    data_version: int
+
+
+class DashboardOut(BaseModel):
+    stats: StatsOut
+    daily: list[DailyStatsOut]
+    urgency: list[UrgencyStatsOut]
+    symptoms: list[SymptomStatOut]
+    calls: CallsListResponse
+
+
+class ReportJobOut(BaseModel):
+    id: str
+    status: str
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,68 @@
+"""Content-addressed cache of transcription and analysis results.
+
+Keys hash every input that determines the model output: the audio bytes plus
+transcription settings for transcripts, and the model, system prompt and
+transcript for analyses. Webhook re-deliveries, job retries and
+re-analysis runs therefore never pay for the same model call twice, while a
+prompt or model change naturally misses the cache.
+"""
+
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import settings
+from app.database import async_session
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.services.openai_service import ANALYSIS_SYSTEM_PROMPT, TRANSCRIPTION_LANGUAGE, TRANSCRIPTION_MODEL
+
+TRANSCRIPT = "transcript"
+ANALYSIS = "analysis"
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def transcript_key(audio_sha256: str) -> str:
+    return _digest(TRANSCRIPTION_MODEL, TRANSCRIPTION_LANGUAGE, audio_sha256)
+
+
+def analysis_key(transcript: str) -> str:
+    return _digest(settings.openai_model, ANALYSIS_SYSTEM_PROMPT, transcript)
+
+
+async def get(kind: str, key: str) -> Any | None:
+    async with async_session() as db:
+        return await db.scalar(
+            select(AnalysisCacheEntry.value)
+            .where(AnalysisCacheEntry.kind == kind, AnalysisCacheEntry.key_hash == key)
+        )
+
+
+async def put(kind: str, key: str, value: Any) -> None:
+    async with async_session() as db:
+        await db.execute(
+            pg_insert(AnalysisCacheEntry)
+            .values(kind=kind, key_hash=key, value=value)
+            .on_conflict_do_nothing()
+        )
+        await db.commit()
+
+
+async def get_or_compute(kind: str, key: str, compute: Callable[[], Awaitable[Any]]) -> Any | None:
+    """Cached value, or ``compute()``; only non-empty results are stored."""
+    value = await get(kind, key)
+    if value is not None:
+        return value
+    value = await compute()
+    if value:
+        await put(kind, key, value)
+    return value
@@ -0,0 +1,171 @@
+"""Data versioning and the in-process caches for stats and list counts.
+
+Every write transaction on calls bumps the ``data_version`` row right before
+committing (see ``call_service._commit``). Cached entries are keyed by the
+version observed when they were computed, so a bump makes them unreachable.
+With ``pg_notify_enabled`` the bump is also broadcast via NOTIFY, so every
+worker invalidates, not just the one that wrote.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from sqlalchemy import Text, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.data_version import DataVersion
+
+DATA_VERSION_CHANNEL = "medicall_data_version"
+
+_version = 0
+_caches: list["TTLCache"] = []
+
+
+def current_version() -> int:
+    return _version
+
+
+def observe_version(version: int) -> None:
+    """Advance the local data version; versions only ever move forward."""
+    global _version
+    if version > _version:
+        _version = version
+        for cache in _caches:
+            cache.clear()
+
+
+def observe_notification(payload: str) -> None:
+    observe_version(int(payload))
+
+
+async def load_version(db: AsyncSession) -> int:
+    version = await db.scalar(select(DataVersion.version).where(DataVersion.id == 1))
+    observe_version(version or 0)
+    return _version
+
+
+async def validated_version(db: AsyncSession) -> int:
+    """Data version for ETags: the local one when NOTIFY keeps it current, else a fresh read."""
+    if settings.pg_notify_enabled:
+        return _version
+    return await load_version(db)
+
+
+async def next_version(db: AsyncSession) -> int:
+    """Bump the data version inside the caller's transaction.
+
+    The row lock is held until commit, so call this last before committing.
+    """
+    bump = (
+        update(DataVersion)
+        .where(DataVersion.id == 1)
+        .values(version=DataVersion.version + 1)
+        .returning(DataVersion.version)
+    )
+    if not settings.pg_notify_enabled:
+        return (await db.execute(bump)).scalar_one()
+    # NOTIFY is transactional: other workers only hear about committed bumps
+    v = bump.cte("v")
+    row = (await db.execute(
+        select(v.c.version, func.pg_notify(DATA_VERSION_CHANNEL, cast(v.c.version, Text)))
+    )).one()
+    return row.version
+
+
+class _LeaderCancelled(Exception):
+    """The request computing a shared value was cancelled before finishing."""
+
+
+class TTLCache:
+    """Size-bounded LRU with per-entry TTL and single-flight computation."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        _caches.append(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        versioned = (key, current_version())
+        value = self.get(versioned)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(versioned)
+        if inflight is not None:
+            self.hits += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LeaderCancelled:
+                # Our own request is still alive: compute with our own ``compute``
+                return await self.get_or_compute(key, compute)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[versioned] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # Only the leader's request went away; waiters must not inherit that
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(value)
+            if versioned[1] == current_version():
+                self.set(versioned, value)
+            return value
+        finally:
+            del self._inflight[versioned]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "data_version": current_version(),
+        }
+
+
+stats_cache = TTLCache(settings.stats_cache_max_entries, settings.stats_cache_ttl_seconds)
+count_cache = TTLCache(settings.count_cache_max_entries, settings.stats_cache_ttl_seconds)
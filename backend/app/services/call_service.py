@@ -1,9 +1,167 @@
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, time, timedelta, timezone
+from typing import NamedTuple
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import DateTime, Select, case, delete, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.call import Call
+from app.config import settings
+from app.services import (
+    cache_service,
+    event_service,
+    job_service,
+    rollup_service,
+    symptom_service,
+)
+from app.services.cache_service import count_cache
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.explain import Explain, parse_plan
+
+
+async def _commit(db: AsyncSession, event_type: str, ids: list[int]) -> None:
+    """Commit a write, bumping the data version that keys every read cache
+    and publishing the change to live event subscribers."""
+    version = await cache_service.next_version(db)
+    event = event_service.make_event(event_type, ids, version)
+    notified = await event_service.publish(db, event)
+    await db.commit()
+    cache_service.observe_version(version)
+    if not notified:
+        event_service.dispatch(event)
+
+
+class CallsPage(NamedTuple):
+    calls: list[RowMapping]
+    total: int | None
+    next_cursor: str | None
+    has_more: bool
+
+
+SEARCH_CONFIG = "german"
+
+# Supported list shapes: any combination of the status/urgency filters with one
+# of these sorts, tie-broken by id. Each shape is served by an index from
+# migration 006 (verified by scripts/check_query_plans.py) and supports keyset
+# pagination. Full-text searches may additionally sort by "relevance".
+SORT_COLUMNS = {
+    "time": Call.time,
+    "created_at": Call.created_at,
+    "updated_at": Call.updated_at,
+    "name": Call.name,
+    "urgency": Call.urgency,
+}
+RELEVANCE_SORT = "relevance"
+
+# Columns the call list returns by default; summary and notes are opt-in via
+# ``fields`` and the transcript is only ever served by GET /calls/{id}
+LIST_FIELDS = (
+    "id", "name", "phone", "urgency", "time", "duration", "status", "symptoms",
+    "callback_requested", "callback_completed", "callback_completed_at",
+    "created_at", "updated_at",
+)
+SELECTABLE_LIST_FIELDS = frozenset(LIST_FIELDS) | {"summary", "notes"}
+EXPORT_FIELDS = (*LIST_FIELDS, "summary", "notes")
+EXPORT_BATCH_SIZE = 2000
+
+PROCESSING_SUMMARY = "Anruf wird verarbeitet…"
+PROCESSING_FAILED_SUMMARY = "Verarbeitung fehlgeschlagen – bitte Aufnahme manuell prüfen."
+
+
+def _search_query(search: str):
+    return func.websearch_to_tsquery(SEARCH_CONFIG, search)
+
+
+def _filters(
+    search: str | None, status: str | None, urgency: str | None, search_mode: str = "basic",
+) -> list:
+    conditions = []
+    if search:
+        # ILIKE '%term%' is served by the pg_trgm GIN indexes on name and phone
+        pattern = f"%{search}%"
+        matches = [Call.name.ilike(pattern), Call.phone.ilike(pattern)]
+        if search_mode == "fulltext":
+            matches.append(Call.search_vector.op("@@")(_search_query(search)))
+        conditions.append(or_(*matches))
+    if status:
+        conditions.append(Call.status == status)
+    if urgency:
+        conditions.append(Call.urgency == urgency)
+    return conditions
+
+
+async def _estimate_count(db: AsyncSession, conditions: list) -> int:
+    """Planner row estimate; small results are cheap enough to count exactly."""
+    plan = parse_plan(await db.scalar(Explain(select(Call.id).where(*conditions))))
+    estimate = int(plan["Plan Rows"])
+    if estimate < settings.count_estimate_exact_below:
+        return await db.scalar(select(func.count(Call.id)).where(*conditions)) or 0
+    return estimate
+
+
+async def _count(db: AsyncSession, conditions: list, count_mode: str, cache_key: tuple) -> int | None:
+    if count_mode == "none":
+        return None
+    if count_mode == "estimate":
+        # Cached per filter combination until the next write bumps the data version
+        return await count_cache.get_or_compute(cache_key, lambda: _estimate_count(db, conditions))
+    return await db.scalar(select(func.count(Call.id)).where(*conditions)) or 0
+
+
+def _keyset_condition(cursor: str, sort: str, order: str):
+    payload = decode_cursor(cursor)
+    if payload["s"] != sort or payload["o"] != order:
+        raise ValueError("Cursor does not match the requested sort order")
+    column = SORT_COLUMNS[sort]
+    try:
+        value = payload["v"]
+        if isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        after = tuple_(value, int(payload["id"]))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    key = tuple_(column, Call.id)
+    return key > after if order == "asc" else key < after
+
+
+def resolve_sort(sort: str | None, search: str | None, search_mode: str) -> str:
+    """Validate ``sort`` against the supported shapes; raises ValueError otherwise."""
+    fulltext = bool(search) and search_mode == "fulltext"
+    if not sort:
+        return RELEVANCE_SORT if fulltext else "time"
+    if sort in SORT_COLUMNS or (sort == RELEVANCE_SORT and fulltext):
+        return sort
+    raise ValueError(f"Unsupported sort '{sort}'")
+
+
+def list_query(
+    *columns,
+    search: str | None = None,
+    status: str | None = None,
+    urgency: str | None = None,
+    sort: str = "time",
+    order: str = "desc",
+    cursor: str | None = None,
+    search_mode: str = "basic",
+) -> Select:
+    """Filtered, ordered SELECT of ``columns`` (default: Call) without OFFSET/LIMIT."""
+    conditions = _filters(search, status, urgency, search_mode)
+    if sort == RELEVANCE_SORT:
+        if cursor:
+            raise ValueError("Cursor pagination is not supported for relevance sort")
+        sort_column = func.ts_rank_cd(Call.search_vector, _search_query(search))
+    else:
+        sort_column = SORT_COLUMNS[sort]
+        if cursor:
+            conditions.append(_keyset_condition(cursor, sort, order))
+    direction = (lambda c: c.asc()) if order == "asc" else (lambda c: c.desc())
+    return (
+        select(*(columns or (Call,)))
+        .where(*conditions)
+        .order_by(direction(sort_column), direction(Call.id))
+    )
 
 
 async def get_calls(
@@ -16,66 +174,413 @@ async def get_calls(
     limit: int = 10,
     sort: str | None = None,
     order: str = "desc",
-) -> tuple[list[Call], int]:
-    query = select(Call)
-    count_query = select(func.count(Call.id))
+    cursor: str | None = None,
+    search_mode: str = "basic",
+    count_mode: str = "exact",
+    fields: Sequence[str] = LIST_FIELDS,
+) -> CallsPage:
+    """List calls with either offset (``skip``) or keyset (``cursor``) pagination.
 
-    if search:
-        pattern = f"%{search}%"
-        search_filter = or_(Call.name.ilike(pattern), Call.phone.ilike(pattern))
-        query = query.where(search_filter)
-        count_query = count_query.where(search_filter)
+    Only ``fields`` (plus ``id`` and the sort column) are selected, so the
+    heavy text columns are never loaded unless asked for.
 
-    if status:
-        query = query.where(Call.status == status)
-        count_query = count_query.where(Call.status == status)
+    ``search_mode="fulltext"`` additionally matches summary, symptoms, notes
+    and transcript, and sorts by relevance unless another sort is given.
 
-    if urgency:
-        query = query.where(Call.urgency == urgency)
-        count_query = count_query.where(Call.urgency == urgency)
+    ``count_mode`` picks how ``total`` is computed: ``exact`` runs a COUNT,
+    ``estimate`` uses a cached count or the planner's estimate, and ``none``
+    skips it (``total`` is None; use ``has_more``).
+
+    Raises ValueError for an unknown field, an unsupported sort, a malformed
+    cursor, or a cursor used with relevance sort.
+    """
+    unknown = set(fields) - SELECTABLE_LIST_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    sort = resolve_sort(sort, search, search_mode)
+    order = "asc" if order == "asc" else "desc"
+    selected = dict.fromkeys(["id", *fields, *([sort] if sort in SORT_COLUMNS else [])])
+    query = list_query(
+        *(getattr(Call, name) for name in selected),
+        search=search, status=status, urgency=urgency,
+        sort=sort, order=order, cursor=cursor, search_mode=search_mode,
+    )
+    if not cursor:
+        query = query.offset(skip)
 
-    total = await db.scalar(count_query) or 0
+    conditions = _filters(search, status, urgency, search_mode)
+    total = await _count(
+        db, conditions, count_mode, ("calls", search, status, urgency, search_mode),
+    )
 
-    sort_column = getattr(Call, sort, None) if sort else None
-    if sort_column is None:
-        sort_column = Call.time
-    query = query.order_by(sort_column.asc() if order == "asc" else sort_column.desc())
+    # One extra row tells us whether there is a next page
+    result = await db.execute(query.limit(limit + 1))
+    calls = list(result.mappings().all())
+    next_cursor = None
+    has_more = len(calls) > limit
+    if has_more:
+        calls = calls[:limit]
+        if sort in SORT_COLUMNS:
+            last = calls[-1]
+            next_cursor = encode_cursor(sort, order, last[sort], last["id"])
+    return CallsPage(calls, total, next_cursor, has_more)
 
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    calls = list(result.scalars().all())
-    return calls, total
+
+def export_query(
+    *,
+    search: str | None = None,
+    status: str | None = None,
+    urgency: str | None = None,
+    sort: str | None = None,
+    order: str = "desc",
+    search_mode: str = "basic",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    fields: Sequence[str] = EXPORT_FIELDS,
+) -> Select:
+    """Unpaginated ``get_calls`` query, optionally limited to UTC days [date_from, date_to].
+
+    Raises ValueError for an unknown field or an unsupported sort.
+    """
+    unknown = set(fields) - SELECTABLE_LIST_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    query = list_query(
+        *(getattr(Call, name) for name in fields),
+        search=search, status=status, urgency=urgency,
+        sort=resolve_sort(sort, search, search_mode),
+        order="asc" if order == "asc" else "desc",
+        search_mode=search_mode,
+    )
+    if date_from:
+        query = query.where(Call.time >= datetime.combine(date_from, time(), timezone.utc))
+    if date_to:
+        end = datetime.combine(date_to + timedelta(days=1), time(), timezone.utc)
+        query = query.where(Call.time < end)
+    return query
+
+
+async def stream_rows(
+    db: AsyncSession, query: Select, batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """Yield ``query``'s rows in batches from a server-side cursor."""
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for batch in result.mappings().partitions():
+        yield batch
 
 
 async def get_call(db: AsyncSession, call_id: int) -> Call | None:
     return await db.get(Call, call_id)
 
 
-async def toggle_status(db: AsyncSession, call: Call) -> Call:
-    call.status = "read" if call.status == "unread" else "unread"
-    call.updated_at = datetime.now(timezone.utc)
-    await db.commit()
+async def _created(db: AsyncSession, call: Call, recording_url: str | None) -> None:
+    """Counters, processing job and commit for a freshly inserted call."""
+    key = rollup_service.key_for(call)
+    await rollup_service.apply(db, added=[key])
+    await symptom_service.apply(db, added=[(key.day, call.symptoms)])
+    if recording_url:
+        await job_service.enqueue(db, call.id, recording_url)
+    await _commit(db, event_service.CREATED, [call.id])
+    if recording_url:
+        job_service.wake()
+
+
+async def create_call(db: AsyncSession, *, recording_url: str | None = None, **fields) -> Call:
+    """Insert a call; with ``recording_url``, also queue its processing job atomically."""
+    call = Call(**fields)
+    db.add(call)
+    await db.flush()
+    await _created(db, call, recording_url)
     await db.refresh(call)
     return call
 
 
-async def update_notes(db: AsyncSession, call: Call, notes: str) -> Call:
-    call.notes = notes
-    call.updated_at = datetime.now(timezone.utc)
-    await db.commit()
-    await db.refresh(call)
+async def ingest_call(
+    db: AsyncSession, *, twilio_call_sid: str, recording_url: str | None = None, **fields,
+) -> tuple[Call, bool]:
+    """``create_call`` that is idempotent per Twilio CallSid; returns (call, created).
+
+    A redelivered webhook finds the existing row and queues nothing. A
+    concurrent duplicate waits on the unique index until the first commits.
+    """
+    stmt = (
+        pg_insert(Call)
+        .values(twilio_call_sid=twilio_call_sid, **fields)
+        .on_conflict_do_nothing(
+            index_elements=[Call.twilio_call_sid],
+            index_where=Call.twilio_call_sid.isnot(None),
+        )
+        .returning(Call)
+    )
+    call = (await db.scalars(stmt)).one_or_none()
+    if call is None:
+        await db.rollback()
+        existing = await db.scalars(select(Call).where(Call.twilio_call_sid == twilio_call_sid))
+        return existing.one(), False
+    await _created(db, call, recording_url)
+    return call, True
+
+
+async def ingest_calls(
+    db: AsyncSession, calls: Sequence[tuple[dict, str | None]],
+) -> list[tuple[int, bool]]:
+    """``ingest_call`` for many (fields, recording_url) pairs at once.
+
+    One multi-row INSERT ... RETURNING and one commit for the whole batch;
+    every ``fields`` needs the same keys, including ``twilio_call_sid``.
+    Returns (call id, created) per input, in order. A sid repeated within
+    the batch is inserted once and reported as a duplicate after that.
+    """
+    first: dict[str, int] = {}
+    for n, (fields, _) in enumerate(calls):
+        first.setdefault(fields["twilio_call_sid"], n)
+    stmt = (
+        pg_insert(Call)
+        .values([calls[n][0] for n in first.values()])
+        .on_conflict_do_nothing(
+            index_elements=[Call.twilio_call_sid],
+            index_where=Call.twilio_call_sid.isnot(None),
+        )
+        .returning(
+            Call.id, Call.twilio_call_sid, Call.time, Call.urgency, Call.status,
+            Call.duration, Call.symptoms,
+        )
+    )
+    inserted = {row.twilio_call_sid: row for row in (await db.execute(stmt)).all()}
+    ids = {sid: row.id for sid, row in inserted.items()}
+    if len(ids) < len(first):
+        # Conflicting rows are committed by now: ON CONFLICT waited for them
+        existing = await db.execute(
+            select(Call.twilio_call_sid, Call.id)
+            .where(Call.twilio_call_sid.in_(list(first.keys() - ids.keys())))
+        )
+        ids.update(existing.tuples().all())
+
+    if inserted:
+        rows = list(inserted.values())
+        keys = [rollup_service.key_for(row) for row in rows]
+        await rollup_service.apply(db, added=keys)
+        await symptom_service.apply(db, added=[(key.day, row.symptoms) for key, row in zip(keys, rows)])
+        jobs = [
+            (inserted[sid].id, calls[n][1])
+            for sid, n in first.items() if sid in inserted and calls[n][1]
+        ]
+        await job_service.enqueue_many(db, jobs)
+        await _commit(db, event_service.CREATED, [row.id for row in rows])
+        if jobs:
+            job_service.wake()
+    else:
+        await db.rollback()
+
+    results = []
+    for n, (fields, _) in enumerate(calls):
+        sid = fields["twilio_call_sid"]
+        results.append((ids[sid], sid in inserted and first[sid] == n))
+    return results
+
+
+async def apply_analysis(db: AsyncSession, call: Call, transcript: str, analysis: dict) -> Call:
+    await apply_analyses(db, [(call, transcript, analysis)])
     return call
 
 
-async def mark_callback_completed(db: AsyncSession, call: Call) -> Call:
-    call.callback_completed = True
-    call.callback_completed_at = datetime.now(timezone.utc)
-    call.updated_at = datetime.now(timezone.utc)
-    await db.commit()
-    await db.refresh(call)
+async def apply_analyses(db: AsyncSession, results: Sequence[tuple[Call, str, dict]]) -> None:
+    """Write analysis results for loaded calls in one flush and one commit.
+
+    The calls are re-read ``FOR UPDATE`` first, so the rollup moves each call
+    out of the bucket it is in now, not the one it was in when loaded; calls
+    deleted in the meantime are skipped.
+    """
+    # populate_existing refreshes the caller's objects with the locked row state
+    locked = {call.id for call in await db.scalars(
+        select(Call)
+        .where(Call.id.in_([call.id for call, _, _ in results]))
+        .order_by(Call.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )}
+    results = [result for result in results if result[0].id in locked]
+    removed, added, removed_symptoms, added_symptoms = [], [], [], []
+    now = datetime.now(timezone.utc)
+    for call, transcript, analysis in results:
+        before = rollup_service.key_for(call)
+        removed.append(before)
+        removed_symptoms.append((before.day, list(call.symptoms)))
+        call.transcript = transcript
+        call.name = analysis.get("name", "Unbekannt")
+        call.summary = analysis.get("summary", "")
+        call.symptoms = analysis.get("symptoms", [])
+        call.urgency = analysis.get("urgency", "medium")
+        call.callback_requested = analysis.get("callback_requested", False)
+        call.updated_at = now
+        added.append(rollup_service.key_for(call))
+        added_symptoms.append((before.day, call.symptoms))
+    if not results:
+        await db.rollback()
+        return
+    await rollup_service.apply(db, removed=removed, added=added)
+    await symptom_service.apply(db, removed=removed_symptoms, added=added_symptoms)
+    await _commit(db, event_service.UPDATED, [call.id for call, _, _ in results])
+
+
+def selection(
+    *,
+    ids: Sequence[int] | None = None,
+    search: str | None = None,
+    status: str | None = None,
+    urgency: str | None = None,
+    search_mode: str = "basic",
+) -> list:
+    """WHERE conditions for a bulk operation: explicit ids or the list filters."""
+    if ids is not None:
+        return [Call.id.in_(ids)]
+    return _filters(search, status, urgency, search_mode)
+
+
+def _flip(status: str) -> str:
+    return "read" if status == "unread" else "unread"
+
+
+async def _update_one(
+    db: AsyncSession, call_id: int, expected: Sequence[datetime] | None, **values,
+) -> Call | None:
+    """UPDATE ... RETURNING the full row in a single round trip.
+
+    With ``expected``, only updates if ``updated_at`` is still one of those
+    values (If-Match); otherwise returns None just like a missing call.
+    """
+    conditions = [Call.id == call_id]
+    if expected is not None:
+        conditions.append(Call.updated_at.in_(expected))
+    stmt = (
+        update(Call)
+        .where(*conditions)
+        .values(**values, updated_at=datetime.now(timezone.utc))
+        .returning(Call)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    return (await db.scalars(stmt)).one_or_none()
+
+
+async def apply_triage(db: AsyncSession, call_id: int, transcript: str, urgency: str) -> Call | None:
+    """Raise a still-processing call to the pre-triaged ``urgency``; commits if it changed.
+
+    Calls whose analysis already landed are left alone, as the LLM result is
+    authoritative. The transcript is stored with it, so it survives a
+    failing analysis.
+    """
+    before = await db.scalar(
+        select(Call.urgency)
+        .where(Call.id == call_id, Call.summary == PROCESSING_SUMMARY, Call.urgency != urgency)
+        .with_for_update()
+    )
+    if before is None:
+        return None
+    call = await _update_one(db, call_id, None, urgency=urgency, transcript=transcript)
+    after = rollup_service.key_for(call)
+    await rollup_service.apply(db, removed=[after._replace(urgency=before)], added=[after])
+    await _commit(db, event_service.UPDATED, [call.id])
     return call
 
 
-async def delete_call(db: AsyncSession, call: Call) -> None:
-    await db.delete(call)
-    await db.commit()
+async def get_call_updated_at(db: AsyncSession, call_id: int) -> datetime | None:
+    return await db.scalar(select(Call.updated_at).where(Call.id == call_id))
+
+
+async def toggle_status(
+    db: AsyncSession, call_id: int, *, expected: Sequence[datetime] | None = None,
+) -> Call | None:
+    call = await _update_one(
+        db, call_id, expected, status=case((Call.status == "unread", "read"), else_="unread"),
+    )
+    if call is None:
+        return None
+    after = rollup_service.key_for(call)
+    await rollup_service.apply(db, removed=[after._replace(status=_flip(call.status))], added=[after])
+    await _commit(db, event_service.UPDATED, [call.id])
+    return call
+
+
+async def update_notes(
+    db: AsyncSession, call_id: int, notes: str, *, expected: Sequence[datetime] | None = None,
+) -> Call | None:
+    call = await _update_one(db, call_id, expected, notes=notes)
+    if call is not None:
+        await _commit(db, event_service.UPDATED, [call.id])
+    return call
+
+
+async def mark_callback_completed(
+    db: AsyncSession, call_id: int, *, expected: Sequence[datetime] | None = None,
+) -> Call | None:
+    call = await _update_one(
+        db, call_id, expected,
+        callback_completed=True, callback_completed_at=datetime.now(timezone.utc),
+    )
+    if call is not None:
+        await _commit(db, event_service.UPDATED, [call.id])
+    return call
+
+
+async def mark_processing_failed(db: AsyncSession, call_id: int) -> None:
+    """Replace the "processing" placeholder once a recording job gave up; commits."""
+    await _update_one(db, call_id, None, summary=PROCESSING_FAILED_SUMMARY)
+    await _commit(db, event_service.UPDATED, [call_id])
+
+
+async def delete_call(db: AsyncSession, call_id: int) -> bool:
+    return bool(await delete_calls(db, [Call.id == call_id]))
+
+
+async def set_status(db: AsyncSession, where: list, status: str) -> list[int]:
+    """Set ``status`` on every selected call; returns the ids that changed."""
+    stmt = (
+        update(Call)
+        .where(*where, Call.status != status)
+        .values(status=status, updated_at=datetime.now(timezone.utc))
+        .returning(Call.id, Call.time, Call.urgency, Call.status, Call.duration)
+        .execution_options(synchronize_session=False)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return []
+    added = [rollup_service.key_for(row) for row in rows]
+    await rollup_service.apply(
+        db, removed=[key._replace(status=_flip(status)) for key in added], added=added,
+    )
+    await _commit(db, event_service.UPDATED, [row.id for row in rows])
+    return [row.id for row in rows]
+
+
+async def complete_callbacks(db: AsyncSession, where: list) -> list[int]:
+    now = datetime.now(timezone.utc)
+    stmt = (
+        update(Call)
+        .where(*where, Call.callback_completed.is_(False))
+        .values(callback_completed=True, callback_completed_at=now, updated_at=now)
+        .returning(Call.id)
+        .execution_options(synchronize_session=False)
+    )
+    ids = list((await db.scalars(stmt)).all())
+    if ids:
+        await _commit(db, event_service.UPDATED, ids)
+    return ids
+
+
+async def delete_calls(db: AsyncSession, where: list) -> list[int]:
+    stmt = (
+        delete(Call)
+        .where(*where)
+        .returning(Call.id, Call.time, Call.urgency, Call.status, Call.duration, Call.symptoms)
+        .execution_options(synchronize_session=False)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return []
+    keys = [rollup_service.key_for(row) for row in rows]
+    await rollup_service.apply(db, removed=keys)
+    await symptom_service.apply(
+        db, removed=[(key.day, row.symptoms) for key, row in zip(keys, rows)],
+    )
+    await _commit(db, event_service.DELETED, [row.id for row in rows])
+    return [row.id for row in rows]
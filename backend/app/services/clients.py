@@ -0,0 +1,64 @@
+"""Shared outbound HTTP clients: one pooled httpx client and one OpenAI client.
+
+Both keep connections alive across requests and recording jobs, so a call
+no longer pays fresh TCP and TLS handshakes for every download and every
+OpenAI request. The app lifespan closes them on shutdown; they are created
+lazily, so scripts and workers outside the app can use them too.
+"""
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import settings
+
+_http: httpx.AsyncClient | None = None
+_openai: AsyncOpenAI | None = None
+
+
+def _new_http_client(**kwargs) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(settings.http_timeout_seconds, connect=10.0),
+        **kwargs,
+    )
+
+
+def http() -> httpx.AsyncClient:
+    """Client for plain HTTP fetches, e.g. Twilio recording downloads."""
+    global _http
+    if _http is None:
+        _http = _new_http_client(follow_redirects=True)
+    return _http
+
+
+def openai() -> AsyncOpenAI | None:
+    """The OpenAI client, or None if no API key is configured."""
+    global _openai
+    if _openai is None and settings.openai_api_key:
+        _openai = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+            max_retries=settings.openai_max_retries,
+            http_client=_new_http_client(),
+        )
+    return _openai
+
+
+def start() -> None:
+    """Create the clients up front instead of on the first recording."""
+    http()
+    openai()
+
+
+async def close() -> None:
+    global _http, _openai
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+    if _openai is not None:
+        await _openai.close()
+        _openai = None
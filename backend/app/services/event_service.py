@@ -0,0 +1,110 @@
+"""Live call events (created / updated / deleted) for Server-Sent Events.
+
+Write paths hand their event to ``publish`` inside the write transaction (see
+``call_service._commit``). Without ``pg_notify_enabled`` it is fanned out to
+this worker's subscribers after commit. With it, the event is sent via
+NOTIFY, which Postgres only delivers on commit, and every worker (including
+the writer) fans it out from its LISTEN connection.
+
+Each subscriber has a bounded queue. A client too slow to keep up has its
+backlog dropped and gets a single ``resync`` event telling it to refetch,
+so one stalled browser tab can never hold memory or slow down writers.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CALL_EVENTS_CHANNEL = "medicall_call_events"
+
+CREATED = "call.created"
+UPDATED = "call.updated"
+DELETED = "call.deleted"
+RESYNC = "resync"
+
+# NOTIFY payloads are limited to 8000 bytes; bigger batches say "refetch" instead
+MAX_EVENT_IDS = 500
+
+_subscribers: set["Subscription"] = set()
+
+
+class Subscription:
+    def __init__(self, max_queued: int):
+        self.queue: asyncio.Queue[dict | None] = asyncio.Queue(max_queued)
+        self.dropped = 0
+
+    def put(self, event: dict | None) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(event if event is None else {"type": RESYNC, "ids": None})
+
+    async def get(self, timeout: float) -> dict | None:
+        """Next event, ``None`` once the broker closed; raises TimeoutError when idle."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+def subscribe() -> Subscription:
+    sub = Subscription(settings.sse_queue_size)
+    _subscribers.add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscription) -> None:
+    _subscribers.discard(sub)
+
+
+def subscriber_count() -> int:
+    return len(_subscribers)
+
+
+def close() -> None:
+    """End every open stream, e.g. on shutdown."""
+    for sub in list(_subscribers):
+        sub.put(None)
+    _subscribers.clear()
+
+
+def make_event(event_type: str, ids: list[int], version: int) -> dict[str, Any]:
+    return {
+        "type": event_type,
+        "ids": ids if len(ids) <= MAX_EVENT_IDS else None,
+        "version": version,
+    }
+
+
+def dispatch(event: dict) -> None:
+    for sub in list(_subscribers):
+        sub.put(event)
+
+
+def dispatch_notification(payload: str) -> None:
+    dispatch(json.loads(payload))
+
+
+async def resync() -> None:
+    """Tell every subscriber to refetch, e.g. after LISTEN may have missed events."""
+    dispatch({"type": RESYNC, "ids": None})
+
+
+async def publish(db: AsyncSession, event: dict) -> bool:
+    """Queue ``event`` for delivery on commit.
+
+    Returns True if NOTIFY will deliver it; otherwise the caller must
+    ``dispatch`` it itself once the commit succeeded.
+    """
+    if not settings.pg_notify_enabled:
+        return False
+    await db.execute(select(func.pg_notify(CALL_EVENTS_CHANNEL, json.dumps(event))))
+    return True
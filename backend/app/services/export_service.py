@@ -0,0 +1,72 @@
+"""Streaming CSV / NDJSON serialization of call exports.
+
+Rows are read from a server-side cursor in batches and encoded one batch at a
+time, so memory stays flat regardless of export size. The session is opened
+inside the generator because request dependencies are torn down before a
+StreamingResponse body is sent.
+"""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+
+from sqlalchemy import Select
+
+from app.database import async_session
+from app.services import call_service
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# Spreadsheets evaluate cells starting with these as formulas (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, list):
+        value = "; ".join(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Caller names, phone numbers and LLM summaries are untrusted input
+        return "'" + value
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_chunk(rows: Sequence[Sequence]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def encode(
+    batches: AsyncIterator[Sequence], fields: Sequence[str], fmt: str,
+) -> AsyncIterator[bytes]:
+    """Encode row batches as CSV (with header) or NDJSON, one chunk per batch."""
+    if fmt == "csv":
+        # BOM so Excel picks UTF-8 for umlauts
+        yield "\ufeff".encode() + _csv_chunk([fields])
+    async for batch in batches:
+        if fmt == "csv":
+            yield _csv_chunk([[_csv_value(row[f]) for f in fields] for row in batch])
+        else:
+            yield "".join(
+                json.dumps({f: row[f] for f in fields}, default=_json_default, ensure_ascii=False)
+                + "\n"
+                for row in batch
+            ).encode()
+
+
+async def stream(query: Select, fields: Sequence[str], fmt: str) -> AsyncIterator[bytes]:
+    async with async_session() as db:
+        async for chunk in encode(call_service.stream_rows(db, query), fields, fmt):
+            yield chunk
@@ -0,0 +1,121 @@
+"""Group commit for webhook call inserts.
+
+Under a burst of Twilio webhooks, a transaction per call makes every request
+wait for its own commit and its own pooled connection. ``submit`` instead
+queues the call; a flusher collects everything that arrives within
+``ingest_flush_interval_ms`` (up to ``ingest_max_batch``) and writes it with
+``call_service.ingest_calls``, one multi-row INSERT and one commit. Each
+caller is answered only after that commit, so a 200 to Twilio still means
+the call is durable.
+
+``ingest_flushers`` flushers run side by side, so one batch can collect
+while the previous one commits. If a batch fails, its calls are retried
+one by one, so a single bad row only fails its own request.
+"""
+
+import asyncio
+import logging
+from typing import NamedTuple
+
+from app.config import settings
+from app.database import async_session
+from app.services import call_service
+
+logger = logging.getLogger(__name__)
+
+_queue: asyncio.Queue["_Pending | None"] | None = None
+_tasks: list[asyncio.Task] = []
+
+
+class _Pending(NamedTuple):
+    fields: dict
+    recording_url: str | None
+    future: asyncio.Future
+
+
+async def _ingest_one(fields: dict, recording_url: str | None) -> tuple[int, bool]:
+    async with async_session() as db:
+        call, created = await call_service.ingest_call(db, recording_url=recording_url, **fields)
+        return call.id, created
+
+
+async def submit(*, twilio_call_sid: str, recording_url: str | None = None, **fields) -> tuple[int, bool]:
+    """Insert a call idempotently per CallSid; returns (call id, created) once committed."""
+    fields["twilio_call_sid"] = twilio_call_sid
+    if not _tasks:
+        return await _ingest_one(fields, recording_url)
+    future = asyncio.get_running_loop().create_future()
+    _queue.put_nowait(_Pending(fields, recording_url, future))
+    return await future
+
+
+async def _flush(batch: list[_Pending]) -> None:
+    try:
+        async with async_session() as db:
+            results = await call_service.ingest_calls(db, [(p.fields, p.recording_url) for p in batch])
+    except Exception as exc:
+        if len(batch) > 1:
+            logger.exception("Group commit of %d calls failed; retrying them one by one", len(batch))
+            for pending in batch:
+                await _flush([pending])
+            return
+        results = [exc]
+    for pending, result in zip(batch, results):
+        if pending.future.done():  # the request went away; its call is stored regardless
+            continue
+        if isinstance(result, Exception):
+            pending.future.set_exception(result)
+        else:
+            pending.future.set_result(result)
+
+
+async def _flusher() -> None:
+    interval = settings.ingest_flush_interval_ms / 1000
+    while True:
+        pending = await _queue.get()
+        if pending is None:
+            return
+        # Let concurrent webhooks join this commit
+        await asyncio.sleep(interval)
+        batch, stopping = [pending], False
+        while len(batch) < settings.ingest_max_batch and not _queue.empty():
+            pending = _queue.get_nowait()
+            if pending is None:
+                stopping = True
+                break
+            batch.append(pending)
+        try:
+            await _flush(batch)
+        except Exception:
+            logger.exception("Flushing %d calls failed", len(batch))
+        if stopping:
+            return
+
+
+def start(flushers: int) -> None:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue()
+    for _ in range(flushers - len(_tasks)):
+        _tasks.append(asyncio.create_task(_flusher()))
+
+
+async def stop() -> None:
+    """Commit everything already queued, then stop the flushers.
+
+    ``_tasks`` is emptied first, so webhooks arriving during shutdown commit
+    on their own instead of queueing behind the stop sentinels.
+    """
+    tasks = list(_tasks)
+    _tasks.clear()
+    for _ in tasks:
+        _queue.put_nowait(None)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # A flusher that died early leaves calls behind; they must still be answered
+    leftover = []
+    while not _queue.empty():
+        pending = _queue.get_nowait()
+        if pending is not None:
+            leftover.append(pending)
+    if leftover:
+        await _flush(leftover)
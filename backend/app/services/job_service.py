@@ -0,0 +1,188 @@
+"""Postgres-backed queue of recording jobs.
+
+Jobs are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of
+workers, in one process or spread over several hosts, can poll the same
+table without ever handing out a job twice. A claimed job holds a lease that
+its worker renews while it runs; if the worker dies, the lease runs out and
+the job becomes claimable again. Failures are retried with exponential
+backoff up to ``recording_job_max_attempts``.
+
+Enqueueing happens inside the caller's transaction, so a job exists if and
+only if its call was committed.
+"""
+
+import asyncio
+import random
+from collections.abc import Sequence
+from datetime import timedelta
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.recording_job import RecordingJob
+
+JOBS_CHANNEL = "medicall_recording_jobs"
+
+_work_available = asyncio.Event()
+
+
+def wake() -> None:
+    """Nudge idle workers in this process; they also poll on their own."""
+    _work_available.set()
+
+
+async def wait_for_work(timeout: float) -> None:
+    try:
+        await asyncio.wait_for(_work_available.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    _work_available.clear()
+
+
+async def enqueue(db: AsyncSession, call_id: int, recording_url: str) -> RecordingJob:
+    """Add a job in the caller's transaction; workers see it once that commits."""
+    job = RecordingJob(call_id=call_id, recording_url=recording_url)
+    db.add(job)
+    await db.flush()
+    if settings.pg_notify_enabled:
+        await db.execute(select(func.pg_notify(JOBS_CHANNEL, str(job.id))))
+    return job
+
+
+async def enqueue_many(db: AsyncSession, jobs: Sequence[tuple[int, str]]) -> None:
+    """``enqueue`` for (call_id, recording_url) pairs, as one multi-row INSERT."""
+    if not jobs:
+        return
+    await db.execute(insert(RecordingJob).values([
+        {"call_id": call_id, "recording_url": url} for call_id, url in jobs
+    ]))
+    if settings.pg_notify_enabled:
+        await db.execute(select(func.pg_notify(JOBS_CHANNEL, "")))
+
+
+def _lease_expiry():
+    return func.now() + timedelta(seconds=settings.recording_job_lease_seconds)
+
+
+async def claim(db: AsyncSession, worker_id: str) -> RecordingJob | None:
+    """Claim the next due job (pending, or running with an expired lease) and commit."""
+    due = (
+        select(RecordingJob.id)
+        .where(RecordingJob.status.in_(("pending", "running")), RecordingJob.available_at <= func.now())
+        .order_by(RecordingJob.available_at, RecordingJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(RecordingJob)
+        .where(RecordingJob.id == due)
+        .values(
+            status="running",
+            attempts=RecordingJob.attempts + 1,
+            locked_by=worker_id,
+            available_at=_lease_expiry(),
+            updated_at=func.now(),
+        )
+        .returning(RecordingJob)
+        .execution_options(synchronize_session=False)
+    )
+    job = (await db.scalars(stmt)).one_or_none()
+    await db.commit()
+    return job
+
+
+def _owned(job_id: int, worker_id: str) -> list:
+    """Only the worker holding the lease may touch a running job."""
+    return [
+        RecordingJob.id == job_id,
+        RecordingJob.status == "running",
+        RecordingJob.locked_by == worker_id,
+    ]
+
+
+async def renew_lease(db: AsyncSession, job_id: int, worker_id: str) -> bool:
+    result = await db.execute(
+        update(RecordingJob)
+        .where(*_owned(job_id, worker_id))
+        .values(available_at=_lease_expiry(), updated_at=func.now())
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def complete(db: AsyncSession, job_id: int, worker_id: str) -> None:
+    await db.execute(
+        update(RecordingJob)
+        .where(*_owned(job_id, worker_id))
+        .values(status="done", locked_by=None, last_error=None, updated_at=func.now())
+    )
+    await db.commit()
+
+
+async def release(db: AsyncSession, job_id: int, worker_id: str) -> None:
+    """Hand an interrupted job back without counting the attempt (e.g. on shutdown)."""
+    await db.execute(
+        update(RecordingJob)
+        .where(*_owned(job_id, worker_id))
+        .values(
+            status="pending",
+            attempts=RecordingJob.attempts - 1,
+            locked_by=None,
+            available_at=func.now(),
+            updated_at=func.now(),
+        )
+    )
+    await db.commit()
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter, so failed jobs do not retry in lockstep."""
+    delay = settings.recording_job_backoff_seconds * 2 ** (attempts - 1)
+    return min(delay, settings.recording_job_max_backoff_seconds) * random.uniform(0.5, 1.0)
+
+
+async def fail(db: AsyncSession, job: RecordingJob, worker_id: str, error: str) -> bool:
+    """Schedule a retry, or give up after the last attempt. Does not commit.
+
+    Returns True if the job failed permanently.
+    """
+    final = job.attempts >= settings.recording_job_max_attempts
+    values = {"locked_by": None, "last_error": error[:2000], "updated_at": func.now()}
+    if final:
+        values["status"] = "failed"
+    else:
+        values["status"] = "pending"
+        values["available_at"] = func.now() + timedelta(seconds=backoff_seconds(job.attempts))
+    await db.execute(update(RecordingJob).where(*_owned(job.id, worker_id)).values(**values))
+    return final
+
+
+async def retry_failed(db: AsyncSession, call_ids: Sequence[int]) -> list[int]:
+    """Give permanently failed jobs of ``call_ids`` a fresh set of attempts."""
+    if not call_ids:
+        return []
+    result = await db.execute(
+        update(RecordingJob)
+        .where(RecordingJob.call_id.in_(call_ids), RecordingJob.status == "failed")
+        .values(status="pending", attempts=0, available_at=func.now(), updated_at=func.now())
+        .returning(RecordingJob.call_id)
+    )
+    requeued = list(result.scalars())
+    if requeued and settings.pg_notify_enabled:
+        await db.execute(select(func.pg_notify(JOBS_CHANNEL, "")))
+    await db.commit()
+    return requeued
+
+
+async def queue_depth(db: AsyncSession) -> dict[str, int]:
+    """Open jobs: ``ready`` to claim now, ``delayed`` by backoff, and ``running``."""
+    row = (await db.execute(
+        select(
+            func.count().filter(RecordingJob.status == "pending", RecordingJob.available_at <= func.now()),
+            func.count().filter(RecordingJob.status == "pending", RecordingJob.available_at > func.now()),
+            func.count().filter(RecordingJob.status == "running"),
+        ).where(RecordingJob.status.in_(("pending", "running")))
+    )).one()
+    return {"ready": row[0], "delayed": row[1], "running": row[2]}
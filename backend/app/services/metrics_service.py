@@ -0,0 +1,70 @@
+"""Prometheus metrics for the recording pipeline and the HTTP API.
+
+Process-local metrics live in the default registry. When uvicorn runs
+several workers, set ``PROMETHEUS_MULTIPROC_DIR`` (an empty directory, wiped
+on deploy) and ``render`` aggregates every worker's files. Recording-job
+queue depth is read from the database on each scrape, so it is the same no
+matter which worker or process answers.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import job_service
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Whisper and GPT take seconds to tens of seconds; downloads and writes far less
+STAGE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+RECORDING_STAGE_SECONDS = Histogram(
+    "medicall_recording_stage_seconds",
+    "Duration of each recording pipeline stage.",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+RECORDING_PIPELINES_IN_FLIGHT = Gauge(
+    "medicall_recording_pipelines_in_flight",
+    "Recording jobs currently being processed by this process.",
+    multiprocess_mode="livesum",
+)
+RECORDING_JOBS = Counter(
+    "medicall_recording_jobs",
+    "Finished recording job attempts by outcome (done, retried, failed, released).",
+    ["outcome"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "medicall_http_request_duration_seconds",
+    "Time from request to response headers, per route template.",
+    ["method", "route", "status"],
+)
+
+
+async def render(db: AsyncSession) -> bytes:
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    # Shared state, read fresh per scrape rather than tracked per process
+    scrape = CollectorRegistry()
+    depth = Gauge(
+        "medicall_recording_jobs_queued",
+        "Open recording jobs by state (ready, delayed by backoff, running).",
+        ["state"],
+        registry=scrape,
+    )
+    for state, count in (await job_service.queue_depth(db)).items():
+        depth.labels(state).set(count)
+    return generate_latest(registry) + generate_latest(scrape)
@@ -0,0 +1,90 @@
+"""Postgres LISTEN/NOTIFY fan-in for multi-worker deployments.
+
+A single dedicated asyncpg connection listens on every registered channel and
+dispatches payloads to in-process handlers. If the connection drops it is
+re-established with backoff, and the connect callbacks run again so
+subscribers can resynchronise whatever they may have missed.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY_SECONDS = 1.0
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+_handlers: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+_connect_callbacks: list[Callable[[], Awaitable[None]]] = []
+_task: asyncio.Task | None = None
+
+
+def listen(channel: str, handler: Callable[[str], None]) -> None:
+    """Register a handler; takes effect on the next (re)connect."""
+    _handlers[channel].append(handler)
+
+
+def on_connect(callback: Callable[[], Awaitable[None]]) -> None:
+    """Run ``callback`` each time listening (re)starts, to catch up on missed events."""
+    _connect_callbacks.append(callback)
+
+
+def _dsn() -> str:
+    url = make_url(settings.database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _dispatch(_conn, _pid, channel: str, payload: str) -> None:
+    for handler in _handlers.get(channel, ()):
+        try:
+            handler(payload)
+        except Exception:
+            logger.exception("NOTIFY handler for %s failed", channel)
+
+
+async def _run() -> None:
+    delay = RECONNECT_DELAY_SECONDS
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(_dsn())
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            for channel in _handlers:
+                await conn.add_listener(channel, _dispatch)
+            for callback in _connect_callbacks:
+                await callback()
+            delay = RECONNECT_DELAY_SECONDS
+            await closed.wait()
+            logger.warning("LISTEN connection lost, reconnecting")
+        except Exception:
+            logger.exception("LISTEN connection failed, retrying in %.0fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+        finally:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+
+
+async def start() -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run())
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -5,13 +5,16 @@ Requires OPENAI_API_KEY to be set. Gracefully skips if not configured.
 
 import json
 import logging
-
-from openai import AsyncOpenAI
+from typing import IO
 
 from app.config import settings
+from app.services import clients
 
 logger = logging.getLogger(__name__)
 
+TRANSCRIPTION_MODEL = "whisper-1"
+TRANSCRIPTION_LANGUAGE = "de"
+
 ANALYSIS_SYSTEM_PROMPT = """\
 Du bist ein medizinischer Anruf-Analyse-Assistent für eine österreichische Arztpraxis.
 Analysiere das folgende Transkript eines Patientenanrufs und extrahiere die folgenden Informationen.
@@ -32,28 +35,26 @@ Dringlichkeitsstufen:
 """
 
 
-def _get_client() -> AsyncOpenAI | None:
-    if not settings.openai_api_key:
-        return None
-    return AsyncOpenAI(api_key=settings.openai_api_key)
-
-
-async def transcribe_audio(audio_bytes: bytes, filename: str = "recording.wav") -> str | None:
-    client = _get_client()
+async def transcribe_audio(audio: bytes | IO[bytes], filename: str = "recording.wav") -> str | None:
+    """Transcribe ``audio``; file objects are streamed to the upload, not read into memory."""
+    client = clients.openai()
     if not client:
         logger.warning("OpenAI API key not configured — skipping transcription")
         return None
+    if not isinstance(audio, bytes):
+        # A consumed stream cannot be replayed; the recording job retries instead
+        client = client.with_options(max_retries=0)
 
     response = await client.audio.transcriptions.create(
-        model="whisper-1",
-        file=(filename, audio_bytes),
-        language="de",
+        model=TRANSCRIPTION_MODEL,
+        file=(filename, audio),
+        language=TRANSCRIPTION_LANGUAGE,
     )
     return response.text
 
 
 async def analyze_transcript(transcript: str) -> dict | None:
-    client = _get_client()
+    client = clients.openai()
     if not client:
         logger.warning("OpenAI API key not configured — skipping analysis")
         return None
@@ -1,16 +1,78 @@
 import io
-from datetime import date
+from collections.abc import Iterable
+from datetime import date, datetime
+from typing import BinaryIO, NamedTuple
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
-from app.models.call import Call
 
+class ReportRow(NamedTuple):
+    """The call columns a report renders; plain tuples pickle cheaply into the render pool."""
 
-def generate_report_pdf(calls: list[Call], stats: dict) -> bytes:
+    name: str
+    phone: str
+    urgency: str
+    time: datetime | None
+    status: str
+
+
+CALL_TABLE_HEADER = ["Name", "Telefon", "Dringlichkeit", "Zeit", "Status"]
+CALL_TABLE_WIDTHS = [35 * mm, 35 * mm, 30 * mm, 35 * mm, 25 * mm]
+CALL_TABLE_FONT = "Helvetica"
+CALL_TABLE_FONT_SIZE = 8
+CALL_TABLE_PADDING = 4
+CALL_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2563eb")),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, -1), CALL_TABLE_FONT),
+    ("FONTSIZE", (0, 0), (-1, -1), CALL_TABLE_FONT_SIZE),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ("PADDING", (0, 0), (-1, -1), CALL_TABLE_PADDING),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f9fafb")]),
+])
+SUMMARY_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#f0f0f0")),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("PADDING", (0, 0), (-1, -1), 6),
+])
+
+
+def _cell(value: str, width: float) -> str:
+    """``value`` on one line, clipped with an ellipsis to fit a column ``width`` wide."""
+    text = " ".join(value.split())
+    room = width - 2 * CALL_TABLE_PADDING
+    if stringWidth(text, CALL_TABLE_FONT, CALL_TABLE_FONT_SIZE) <= room:
+        return text
+    room -= stringWidth("…", CALL_TABLE_FONT, CALL_TABLE_FONT_SIZE)
+    while text and stringWidth(text, CALL_TABLE_FONT, CALL_TABLE_FONT_SIZE) > room:
+        text = text[:-1]
+    return text.rstrip() + "…"
+
+
+def _call_table(calls: Iterable[ReportRow]) -> Table:
+    rows = [CALL_TABLE_HEADER]
+    for c in calls:
+        values = [
+            c.name or "",
+            c.phone or "",
+            c.urgency or "",
+            c.time.strftime("%d.%m.%Y %H:%M") if c.time else "",
+            c.status or "",
+        ]
+        rows.append([_cell(v, w) for v, w in zip(values, CALL_TABLE_WIDTHS)])
+    table = Table(rows, colWidths=CALL_TABLE_WIDTHS)
+    table.setStyle(CALL_TABLE_STYLE)
+    return table
+
+
+def generate_report_pdf(calls: list[ReportRow], stats: dict) -> bytes:
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=20 * mm, bottomMargin=20 * mm)
     styles = getSampleStyleSheet()
@@ -32,37 +94,97 @@ def generate_report_pdf(calls: list[Call], stats: dict) -> bytes:
         ["Unbearbeitete dringende", str(stats.get("unhandled_urgent", 0))],
     ]
     t = Table(stats_data, colWidths=[120 * mm, 40 * mm])
-    t.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#f0f0f0")),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("PADDING", (0, 0), (-1, -1), 6),
-    ]))
+    t.setStyle(SUMMARY_TABLE_STYLE)
     elements.append(t)
     elements.append(Spacer(1, 8 * mm))
 
     # Calls table
     elements.append(Paragraph("Anrufliste", styles["Heading2"]))
-    header = ["Name", "Telefon", "Dringlichkeit", "Zeit", "Status"]
-    rows = [header]
-    for c in calls[:50]:
-        rows.append([
-            c.name,
-            c.phone,
-            c.urgency,
-            c.time.strftime("%d.%m.%Y %H:%M") if c.time else "",
-            c.status,
-        ])
-    ct = Table(rows, colWidths=[35 * mm, 35 * mm, 30 * mm, 35 * mm, 25 * mm])
-    ct.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2563eb")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTSIZE", (0, 0), (-1, -1), 8),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ("PADDING", (0, 0), (-1, -1), 4),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f9fafb")]),
-    ]))
-    elements.append(ct)
+    elements.append(_call_table(calls[:50]))
 
     doc.build(elements)
     return buffer.getvalue()
+
+
+class RangeReport:
+    """Date-range report drawn page by page straight onto a canvas.
+
+    Rows are fed in batches via ``add_rows``; only one page worth of rows and
+    flowables exists at a time, so a month of calls costs no more memory than
+    a day. Call ``finish`` to write the trailer to ``out``.
+    """
+
+    MARGIN = 20 * mm
+    # _call_table puts every cell on one clipped line, so all rows have the
+    # same height (8pt + padding)
+    FIRST_PAGE_ROWS = 24
+    ROWS_PER_PAGE = 38
+
+    def __init__(self, out: BinaryIO, date_from: date, date_to: date, summary: dict):
+        self.canvas = Canvas(out, pagesize=A4, pageCompression=1)
+        self.canvas.setTitle(f"MediCall-AI Bericht {date_from} – {date_to}")
+        self.width, self.height = A4
+        self.page = 1
+        self.rows_written = 0
+        self._pending: list[ReportRow] = []
+        self._y = self._draw_summary(date_from, date_to, summary)
+
+    def _draw(self, flowable, y: float) -> float:
+        """Draw ``flowable`` with its top at ``y``; returns the y below it."""
+        _, h = flowable.wrapOn(self.canvas, self.width - 2 * self.MARGIN, y - self.MARGIN)
+        flowable.drawOn(self.canvas, self.MARGIN, y - h)
+        return y - h
+
+    def _draw_summary(self, date_from: date, date_to: date, summary: dict) -> float:
+        styles = getSampleStyleSheet()
+        title_style = ParagraphStyle("Title", parent=styles["Title"], fontSize=18, spaceAfter=12)
+        y = self.height - self.MARGIN
+        y = self._draw(Paragraph("MediCall-AI — Bericht", title_style), y) - 12
+        y = self._draw(
+            Paragraph(f"Zeitraum: {date_from.isoformat()} – {date_to.isoformat()}", styles["Normal"]),
+            y,
+        ) - 10 * mm
+        y = self._draw(Paragraph("Übersicht", styles["Heading2"]), y) - 6
+        t = Table([
+            ["Anrufe", str(summary.get("total_calls", 0))],
+            ["Dringende Anrufe", str(summary.get("urgent_calls", 0))],
+            ["Anteil dringend", f"{summary.get('urgent_percentage', 0)} %"],
+            ["Ø Dauer", summary.get("avg_duration", "00:00:00")],
+            ["Ungelesen", str(summary.get("unread_calls", 0))],
+        ], colWidths=[120 * mm, 40 * mm])
+        t.setStyle(SUMMARY_TABLE_STYLE)
+        y = self._draw(t, y) - 8 * mm
+        return self._draw(Paragraph("Anrufliste", styles["Heading2"]), y) - 6
+
+    def _capacity(self) -> int:
+        return self.FIRST_PAGE_ROWS if self.page == 1 else self.ROWS_PER_PAGE
+
+    def _end_page(self) -> None:
+        self.canvas.setFont("Helvetica", 8)
+        self.canvas.drawRightString(self.width - self.MARGIN, self.MARGIN / 2, f"Seite {self.page}")
+        self.canvas.showPage()
+        self.page += 1
+        self._y = self.height - self.MARGIN
+
+    def _flush_page(self, rows: list[ReportRow]) -> None:
+        self._draw(_call_table(rows), self._y)
+        self.rows_written += len(rows)
+        self._end_page()
+
+    def add_rows(self, rows: Iterable[ReportRow]) -> None:
+        self._pending.extend(rows)
+        while len(self._pending) >= self._capacity():
+            n = self._capacity()
+            page, self._pending = self._pending[:n], self._pending[n:]
+            self._flush_page(page)
+
+    def finish(self) -> None:
+        if self._pending or not self.rows_written:
+            if self._pending:
+                self._flush_page(self._pending)
+            else:
+                styles = getSampleStyleSheet()
+                self._draw(Paragraph("Keine Anrufe im Zeitraum.", styles["Normal"]), self._y)
+                self._end_page()
+            self._pending = []
+        self.canvas.save()
@@ -0,0 +1,229 @@
+"""Recording pipeline (download, transcribe, analyze) and the worker pool that runs it.
+
+Workers pull jobs from ``job_service``. ``recording_workers`` of them run
+inside the API process; set it to 0 and run ``scripts/run_worker.py`` to
+move processing to dedicated processes or hosts instead. Either way the
+number of concurrent download/Whisper/GPT pipelines is bounded by the total
+worker count.
+
+As soon as a transcript exists, ``triage_service`` may raise the call to
+high urgency, so staff see e.g. a chest-pain call before the LLM analysis
+lands.
+
+Each stage (download, transcribe, analyze, db_write) and each job outcome
+is recorded in ``metrics_service`` and scraped from ``/api/metrics``.
+
+Recordings are streamed to memory or a temp file and from there to the
+transcription upload, never held as one ``bytes`` object. Recordings kept in
+memory count against a process-wide ``recording_memory_budget_bytes``; when
+it is exhausted, further downloads go to disk instead of waiting.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import socket
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import BinaryIO, NamedTuple
+
+from app.config import settings
+from app.database import async_session
+from app.models.call import Call
+from app.models.recording_job import RecordingJob
+from app.services import (
+    analysis_cache_service,
+    call_service,
+    clients,
+    job_service,
+    metrics_service,
+    openai_service,
+    triage_service,
+)
+from app.utils.budget import ByteBudget
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+memory_budget = ByteBudget(settings.recording_memory_budget_bytes)
+
+_tasks: list[asyncio.Task] = []
+
+
+class Recording(NamedTuple):
+    file: BinaryIO
+    sha256: str
+    size: int
+    in_memory: bool
+
+
+@asynccontextmanager
+async def download(url: str) -> AsyncIterator[Recording]:
+    """Stream ``url`` into memory or a temp file, rewound and ready to read,
+    hashing it on the way for the transcript cache.
+
+    A recording of up to ``recording_spool_max_bytes`` (by Content-Length)
+    stays in a ``BytesIO`` if its size can be reserved from ``memory_budget``
+    right away; anything else goes to a temp file. Reserving once, up front
+    and without waiting, means pipelines never hold part of the budget while
+    blocking on the rest. The file has no ``fileno()``, so the multipart
+    upload reads it from memory instead of spilling it to disk.
+    """
+    spool_max = settings.recording_spool_max_bytes
+    digest = hashlib.sha256()
+    file: BinaryIO | None = None
+    reserved = 0
+    try:
+        with metrics_service.RECORDING_STAGE_SECONDS.labels("download").time():
+            async with clients.http().stream("GET", url) as resp:
+                resp.raise_for_status()
+                length = resp.headers.get("Content-Length", "")
+                expected = int(length) if length.isdigit() else spool_max
+                if expected <= spool_max and memory_budget.try_acquire(expected):
+                    reserved = expected
+                    file = io.BytesIO()
+                else:
+                    file = tempfile.TemporaryFile()
+                size = 0
+                async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > settings.recording_max_bytes:
+                        raise ValueError(f"Recording exceeds {settings.recording_max_bytes} bytes")
+                    if isinstance(file, io.BytesIO) and size > reserved:
+                        # Longer than announced: move what we have to disk
+                        on_disk = tempfile.TemporaryFile()
+                        on_disk.write(file.getbuffer())
+                        file.close()
+                        file = on_disk
+                        memory_budget.release(reserved)
+                        reserved = 0
+                    file.write(chunk)
+                    digest.update(chunk)
+        file.seek(0)
+        yield Recording(file, digest.hexdigest(), size, in_memory=isinstance(file, io.BytesIO))
+    finally:
+        if file is not None:
+            file.close()
+        if reserved:
+            memory_budget.release(reserved)
+
+
+async def process(call_id: int, recording_url: str) -> None:
+    """Run the whole pipeline for one call; raises on any failure so the job is retried."""
+    stage = metrics_service.RECORDING_STAGE_SECONDS.labels
+    async with download(f"{recording_url}.wav") as recording:
+        with stage("transcribe").time():
+            transcript = await analysis_cache_service.get_or_compute(
+                analysis_cache_service.TRANSCRIPT,
+                analysis_cache_service.transcript_key(recording.sha256),
+                lambda: openai_service.transcribe_audio(recording.file),
+            )
+    if not transcript:
+        # Retried with backoff; the call is marked failed after the last attempt
+        raise RuntimeError("Transcription returned no result")
+
+    triage = triage_service.classify(transcript)
+    if triage.urgency:
+        with stage("db_write").time():
+            async with async_session() as db:
+                applied = await call_service.apply_triage(db, call_id, transcript, triage.urgency)
+        if applied:
+            logger.info("Call %d pre-triaged %s (%s)", call_id, triage.urgency, ", ".join(triage.reasons))
+
+    with stage("analyze").time():
+        analysis = await analysis_cache_service.get_or_compute(
+            analysis_cache_service.ANALYSIS,
+            analysis_cache_service.analysis_key(transcript),
+            lambda: openai_service.analyze_transcript(transcript),
+        )
+    if not analysis:
+        raise RuntimeError("Transcript analysis returned no result")
+
+    with stage("db_write").time():
+        async with async_session() as db:
+            call = await db.get(Call, call_id)
+            if not call:
+                return
+            await call_service.apply_analysis(db, call, transcript, analysis)
+    logger.info("Processed recording for call %d", call_id)
+
+
+async def _keep_lease(job_id: int, worker_id: str) -> None:
+    interval = settings.recording_job_lease_seconds / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_session() as db:
+                if not await job_service.renew_lease(db, job_id, worker_id):
+                    logger.warning("Lost the lease on recording job %d", job_id)
+                    return
+        except Exception:
+            logger.exception("Renewing the lease on recording job %d failed", job_id)
+
+
+async def _run(job: RecordingJob, worker_id: str) -> None:
+    lease = asyncio.create_task(_keep_lease(job.id, worker_id))
+    outcome = metrics_service.RECORDING_JOBS.labels
+    try:
+        if job.attempts > settings.recording_job_max_attempts:
+            # Only reachable when workers died holding this job
+            raise RuntimeError("Abandoned by workers too many times")
+        await process(job.call_id, job.recording_url)
+    except asyncio.CancelledError:
+        async with async_session() as db:
+            await job_service.release(db, job.id, worker_id)
+        outcome("released").inc()
+        raise
+    except Exception as exc:
+        logger.exception("Recording job %d for call %d failed (attempt %d)",
+                         job.id, job.call_id, job.attempts)
+        async with async_session() as db:
+            if await job_service.fail(db, job, worker_id, repr(exc)):
+                await call_service.mark_processing_failed(db, job.call_id)
+                outcome("failed").inc()
+            else:
+                await db.commit()
+                outcome("retried").inc()
+    else:
+        async with async_session() as db:
+            await job_service.complete(db, job.id, worker_id)
+        outcome("done").inc()
+    finally:
+        lease.cancel()
+
+
+async def _worker(worker_id: str) -> None:
+    while True:
+        try:
+            async with async_session() as db:
+                job = await job_service.claim(db, worker_id)
+        except Exception:
+            logger.exception("Claiming a recording job failed")
+            job = None
+        if job is None:
+            await job_service.wait_for_work(settings.recording_job_poll_seconds)
+            continue
+        try:
+            with metrics_service.RECORDING_PIPELINES_IN_FLIGHT.track_inprogress():
+                await _run(job, worker_id)
+        except Exception:
+            # Bookkeeping failed (e.g. database down); the lease expiry retries the job
+            logger.exception("Recording job %d could not be finalized", job.id)
+
+
+def start(concurrency: int) -> None:
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    for _ in range(concurrency - len(_tasks)):
+        _tasks.append(asyncio.create_task(_worker(f"{prefix}:{len(_tasks)}")))
+
+
+async def stop() -> None:
+    """Cancel the workers; interrupted jobs are released for another worker."""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
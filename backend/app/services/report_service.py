@@ -0,0 +1,231 @@
+"""PDF report jobs rendered in a process pool.
+
+reportlab is CPU-bound, so rendering runs in worker processes instead of on
+the event loop. Rendered PDFs are cached per data version (see
+``cache_service``), so repeated exports between two writes cost nothing, and
+concurrent requests for the same report share one render.
+
+Date-range reports can span thousands of calls, so the pool worker streams
+them from the database itself and draws the PDF page by page into a temp file
+(see ``pdf_service.RangeReport``); neither process holds the whole range.
+
+Jobs live in the memory of the worker that accepted them; with several
+workers, polling needs sticky sessions.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session, engine
+from app.models.call import Call
+from app.services import cache_service, call_service, pdf_service, stats_service
+from app.services.cache_service import TTLCache
+from app.utils.deps import run_in_session
+
+logger = logging.getLogger(__name__)
+
+REPORT_CALLS_LIMIT = 50
+RANGE_BATCH_SIZE = 1000
+
+report_cache = TTLCache(settings.report_cache_max_entries, settings.report_job_ttl_seconds)
+
+_executor: ProcessPoolExecutor | None = None
+_jobs: dict[str, "ReportJob"] = {}
+_tasks: set[asyncio.Task] = set()
+
+
+@dataclass
+class ReportJob:
+    id: str
+    filename: str
+    status: str = "pending"  # pending -> running -> done | failed
+    error: str | None = None
+    key: tuple | None = None
+    pdf: bytes | None = field(default=None, repr=False)
+    path: str | None = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+    _expires_at: float = field(
+        default_factory=lambda: time.monotonic() + settings.report_job_ttl_seconds, repr=False,
+    )
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that runs an event loop and a DB pool is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.report_workers, mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    for task in _tasks:
+        task.cancel()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    for job in _jobs.values():
+        _remove_file(job.path)
+    _jobs.clear()
+
+
+def _remove_file(path: str | None) -> None:
+    if path is not None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+async def _daily_report_data(db: AsyncSession) -> tuple[list[pdf_service.ReportRow], dict]:
+    stats = await stats_service.get_stats(db)
+    result = await db.execute(
+        select(*(getattr(Call, name) for name in pdf_service.ReportRow._fields))
+        .order_by(Call.time.desc())
+        .limit(REPORT_CALLS_LIMIT)
+    )
+    return [pdf_service.ReportRow(*row) for row in result], stats
+
+
+async def _render_daily() -> bytes:
+    calls, stats = await run_in_session(_daily_report_data)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pool(), pdf_service.generate_report_pdf, calls, stats)
+
+
+def _daily_key() -> tuple:
+    return ("daily", stats_service.utc_today())
+
+
+async def render_daily(db: AsyncSession) -> bytes:
+    """Render (or reuse) today's report for the current data version."""
+    await cache_service.validated_version(db)
+    return await report_cache.get_or_compute(_daily_key(), _render_daily)
+
+
+async def _write_range_report(path: str, date_from: date, date_to: date) -> int:
+    try:
+        async with async_session() as db:
+            summary = await stats_service.get_range_summary(db, date_from, date_to)
+            query = call_service.export_query(
+                date_from=date_from, date_to=date_to, sort="time", order="asc",
+                fields=pdf_service.ReportRow._fields,
+            )
+            with open(path, "wb") as out:
+                report = pdf_service.RangeReport(out, date_from, date_to, summary)
+                async for batch in call_service.stream_rows(db, query, RANGE_BATCH_SIZE):
+                    report.add_rows(pdf_service.ReportRow(**row) for row in batch)
+                report.finish()
+            return report.rows_written
+    finally:
+        # The pool is bound to this process's short-lived event loop
+        await engine.dispose()
+
+
+def render_range_file(path: str, date_from: date, date_to: date) -> int:
+    """Pool entry point: write the [date_from, date_to] report to ``path``; returns the row count."""
+    return asyncio.run(_write_range_report(path, date_from, date_to))
+
+
+async def render_range(date_from: date, date_to: date) -> str:
+    """Render a range report off the event loop; the caller owns (and deletes) the file."""
+    fd, path = tempfile.mkstemp(prefix="medicall-report-", suffix=".pdf")
+    os.close(fd)
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_pool(), render_range_file, path, date_from, date_to)
+    except BaseException:
+        _remove_file(path)
+        raise
+    return path
+
+
+def range_filename(date_from: date, date_to: date) -> str:
+    return f"medicall-report-{date_from.isoformat()}-{date_to.isoformat()}.pdf"
+
+
+def validate_range(date_from: date, date_to: date) -> None:
+    if date_from > date_to:
+        raise ValueError("date_from must not be after date_to")
+    if (date_to - date_from).days >= settings.report_max_days:
+        raise ValueError(f"Reports cover at most {settings.report_max_days} days")
+
+
+async def _run(job: ReportJob) -> None:
+    job.status = "running"
+    try:
+        if job.key[0] == "range":
+            _, date_from, date_to, _ = job.key
+            job.path = await render_range(date_from, date_to)
+        else:
+            job.pdf = await report_cache.get_or_compute(_daily_key(), _render_daily)
+        job.status = "done"
+    except Exception as exc:
+        logger.exception("Report job %s failed", job.id)
+        job.status = "failed"
+        job.error = str(exc) or type(exc).__name__
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+
+
+def _prune() -> None:
+    now = time.monotonic()
+    for job_id in [j.id for j in _jobs.values() if j._expires_at < now]:
+        _remove_file(_jobs.pop(job_id).path)
+
+
+def _start(job: ReportJob) -> ReportJob:
+    _jobs[job.id] = job
+    task = asyncio.create_task(_run(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+async def submit_daily(db: AsyncSession) -> ReportJob:
+    """Start rendering today's report; completes immediately if it is cached."""
+    _prune()
+    await cache_service.validated_version(db)
+    job = ReportJob(id=uuid.uuid4().hex, filename="medicall-report.pdf", key=_daily_key())
+    cached = report_cache.get((job.key, cache_service.current_version()))
+    if cached is not None:
+        job.status, job.pdf, job.finished_at = "done", cached, job.created_at
+        _jobs[job.id] = job
+        return job
+    return _start(job)
+
+
+async def submit_range(db: AsyncSession, date_from: date, date_to: date) -> ReportJob:
+    """Start rendering a range report, reusing a live job for the same range and data version.
+
+    Raises ValueError for an inverted or too long range.
+    """
+    validate_range(date_from, date_to)
+    _prune()
+    key = ("range", date_from, date_to, await cache_service.validated_version(db))
+    for job in _jobs.values():
+        if job.key == key and job.status != "failed":
+            return job
+    return _start(ReportJob(
+        id=uuid.uuid4().hex, filename=range_filename(date_from, date_to), key=key,
+    ))
+
+
+def get_job(job_id: str) -> ReportJob | None:
+    _prune()
+    return _jobs.get(job_id)
@@ -0,0 +1,101 @@
+"""Maintenance of the calls_daily_rollup table.
+
+Every write path that inserts, deletes or changes the urgency/status of a call
+passes the affected rows' keys to ``apply`` inside the same transaction, so the
+rollup commits (or rolls back) together with the call itself.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, timezone
+from typing import NamedTuple
+
+from sqlalchemy import Date, Integer, case, cast, delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.call import Call
+from app.models.rollup import CallDailyRollup
+from app.utils.duration import parse_duration_seconds
+
+
+class RollupKey(NamedTuple):
+    day: date
+    urgency: str
+    status: str
+    duration_seconds: int
+
+
+def key_for(call: Call) -> RollupKey:
+    return RollupKey(
+        day=call.time.astimezone(timezone.utc).date(),
+        urgency=call.urgency,
+        status=call.status,
+        duration_seconds=parse_duration_seconds(call.duration),
+    )
+
+
+def call_day_sql():
+    """UTC calendar day of ``Call.time``, matching ``key_for``."""
+    return cast(func.timezone("UTC", Call.time), Date)
+
+
+def duration_seconds_sql():
+    """SQL twin of ``parse_duration_seconds``: malformed values count as 0."""
+    return case(
+        (
+            Call.duration.regexp_match(r"^\d+:\d+:\d+$"),
+            cast(func.split_part(Call.duration, ":", 1), Integer) * 3600
+            + cast(func.split_part(Call.duration, ":", 2), Integer) * 60
+            + cast(func.split_part(Call.duration, ":", 3), Integer),
+        ),
+        else_=0,
+    )
+
+
+async def apply(
+    db: AsyncSession,
+    *,
+    removed: Iterable[RollupKey] = (),
+    added: Iterable[RollupKey] = (),
+) -> None:
+    deltas: dict[tuple[date, str, str], list[int]] = defaultdict(lambda: [0, 0])
+    for sign, keys in ((-1, removed), (1, added)):
+        for key in keys:
+            delta = deltas[(key.day, key.urgency, key.status)]
+            delta[0] += sign
+            delta[1] += sign * key.duration_seconds
+
+    # Sorted so concurrent writers lock rollup rows in the same order
+    rows = [
+        {"day": d, "urgency": u, "status": s, "call_count": count, "duration_seconds": secs}
+        for (d, u, s), (count, secs) in sorted(deltas.items())
+        if count or secs
+    ]
+    if not rows:
+        return
+
+    stmt = pg_insert(CallDailyRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CallDailyRollup.day, CallDailyRollup.urgency, CallDailyRollup.status],
+        set_={
+            "call_count": CallDailyRollup.call_count + stmt.excluded.call_count,
+            "duration_seconds": CallDailyRollup.duration_seconds + stmt.excluded.duration_seconds,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Recompute the whole rollup from calls. Blocks call writers until commit."""
+    await db.execute(text("LOCK TABLE calls IN SHARE MODE"))
+    await db.execute(delete(CallDailyRollup))
+    day = call_day_sql()
+    result = await db.execute(
+        insert(CallDailyRollup).from_select(
+            ["day", "urgency", "status", "call_count", "duration_seconds"],
+            select(day, Call.urgency, Call.status, func.count(), func.sum(duration_seconds_sql()))
+            .group_by(day, Call.urgency, Call.status),
+        )
+    )
+    return result.rowcount
@@ -1,145 +1,121 @@
-from datetime import date, datetime, time, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
-from sqlalchemy import Integer, cast, func, select, text
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.call import Call
+from app.models.rollup import CallDailyRollup
+from app.models.symptom import Symptom, SymptomDailyCount
+from app.utils.duration import format_duration
 
 
-def _start_of_day(d: date) -> datetime:
-    return datetime.combine(d, time.min, tzinfo=timezone.utc)
+def _sum(column, *conditions):
+    total = func.sum(column)
+    if conditions:
+        total = total.filter(*conditions)
+    return func.coalesce(total, 0)
 
 
-def _end_of_day(d: date) -> datetime:
-    return datetime.combine(d, time.max, tzinfo=timezone.utc)
-
-
-def _parse_duration_seconds(dur: str) -> int:
-    parts = dur.split(":")
-    if len(parts) == 3:
-        return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-    return 0
-
-
-def _format_duration(total_seconds: int) -> str:
-    h = total_seconds // 3600
-    m = (total_seconds % 3600) // 60
-    s = total_seconds % 60
-    return f"{h:02d}:{m:02d}:{s:02d}"
+def utc_today() -> date:
+    """The current UTC day, the day the rollup buckets calls by."""
+    return datetime.now(timezone.utc).date()
 
 
 async def get_stats(db: AsyncSession) -> dict:
-    today = date.today()
+    today = utc_today()
     yesterday = today - timedelta(days=1)
     month_start = today.replace(day=1)
 
-    today_start = _start_of_day(today)
-    today_end = _end_of_day(today)
-    yesterday_start = _start_of_day(yesterday)
-    yesterday_end = _end_of_day(yesterday)
-    month_start_dt = _start_of_day(month_start)
-
-    # Today calls
-    today_calls = await db.scalar(
-        select(func.count(Call.id)).where(Call.time.between(today_start, today_end))
-    ) or 0
-
-    # Urgent calls today
-    urgent_calls = await db.scalar(
-        select(func.count(Call.id)).where(
-            Call.time.between(today_start, today_end), Call.urgency == "high"
+    r = CallDailyRollup
+    is_today = r.day == today
+    is_yesterday = r.day == yesterday
+    is_urgent = r.urgency == "high"
+
+    # All KPIs from the daily rollup in one round trip
+    row = (await db.execute(
+        select(
+            _sum(r.call_count, is_today).label("today_calls"),
+            _sum(r.call_count, is_today, is_urgent).label("urgent_calls"),
+            _sum(r.call_count, is_yesterday).label("yesterday_calls"),
+            _sum(r.call_count, r.day >= month_start).label("month_calls"),
+            _sum(r.call_count, is_urgent, r.status == "unread").label("unhandled_urgent"),
+            _sum(r.call_count).label("total_calls"),
+            _sum(r.call_count, is_urgent).label("total_urgent"),
+            _sum(r.duration_seconds, is_today).label("today_secs"),
+            _sum(r.duration_seconds, is_yesterday).label("yesterday_secs"),
         )
-    ) or 0
-
-    # Yesterday calls
-    yesterday_calls = await db.scalar(
-        select(func.count(Call.id)).where(Call.time.between(yesterday_start, yesterday_end))
-    ) or 0
-
-    # Month calls
-    month_calls = await db.scalar(
-        select(func.count(Call.id)).where(Call.time >= month_start_dt)
-    ) or 0
-
-    # Unhandled urgent (high urgency + unread)
-    unhandled_urgent = await db.scalar(
-        select(func.count(Call.id)).where(Call.urgency == "high", Call.status == "unread")
-    ) or 0
-
-    # Total calls for urgent percentage
-    total_calls = await db.scalar(select(func.count(Call.id))) or 0
-    total_urgent = await db.scalar(
-        select(func.count(Call.id)).where(Call.urgency == "high")
-    ) or 0
-    urgent_percentage = round((total_urgent / total_calls * 100) if total_calls > 0 else 0, 1)
-
-    # Average duration today
-    today_durations = await db.execute(
-        select(Call.duration).where(Call.time.between(today_start, today_end))
-    )
-    today_durs = [row[0] for row in today_durations]
-    if today_durs:
-        avg_secs = sum(_parse_duration_seconds(d) for d in today_durs) // len(today_durs)
-        avg_duration = _format_duration(avg_secs)
-    else:
-        avg_duration = "00:00:00"
-
-    # Average duration yesterday
-    yesterday_durations = await db.execute(
-        select(Call.duration).where(Call.time.between(yesterday_start, yesterday_end))
-    )
-    yesterday_durs = [row[0] for row in yesterday_durations]
-    if yesterday_durs:
-        avg_secs_y = sum(_parse_duration_seconds(d) for d in yesterday_durs) // len(yesterday_durs)
-        avg_duration_yesterday = _format_duration(avg_secs_y)
-    else:
-        avg_duration_yesterday = "00:00:00"
+    )).one()
+
+    def _avg(secs: int, count: int) -> str:
+        return format_duration(int(secs) // count) if count > 0 else "00:00:00"
+
+    total_calls = row.total_calls
+    urgent_percentage = round((row.total_urgent / total_calls * 100) if total_calls > 0 else 0, 1)
 
     return {
-        "today_calls": today_calls,
-        "urgent_calls": urgent_calls,
-        "avg_duration": avg_duration,
-        "month_calls": month_calls,
-        "yesterday_calls": yesterday_calls,
-        "unhandled_urgent": unhandled_urgent,
-        "avg_duration_yesterday": avg_duration_yesterday,
+        "today_calls": row.today_calls,
+        "urgent_calls": row.urgent_calls,
+        "avg_duration": _avg(row.today_secs, row.today_calls),
+        "month_calls": row.month_calls,
+        "yesterday_calls": row.yesterday_calls,
+        "unhandled_urgent": row.unhandled_urgent,
+        "avg_duration_yesterday": _avg(row.yesterday_secs, row.yesterday_calls),
         "urgent_percentage": urgent_percentage,
     }
 
 
+async def get_range_summary(db: AsyncSession, date_from: date, date_to: date) -> dict:
+    """KPIs over the UTC days [date_from, date_to], for range reports."""
+    r = CallDailyRollup
+    is_urgent = r.urgency == "high"
+    row = (await db.execute(
+        select(
+            _sum(r.call_count).label("total_calls"),
+            _sum(r.call_count, is_urgent).label("urgent_calls"),
+            _sum(r.call_count, r.status == "unread").label("unread_calls"),
+            _sum(r.duration_seconds).label("total_secs"),
+        ).where(r.day >= date_from, r.day <= date_to)
+    )).one()
+    total = row.total_calls
+    return {
+        "total_calls": total,
+        "urgent_calls": row.urgent_calls,
+        "unread_calls": row.unread_calls,
+        "avg_duration": format_duration(int(row.total_secs) // total) if total else "00:00:00",
+        "urgent_percentage": round(row.urgent_calls / total * 100, 1) if total else 0,
+    }
+
+
 async def get_daily_stats(db: AsyncSession, days: int = 7) -> list[dict]:
-    today = date.today()
+    today = utc_today()
     start_date = today - timedelta(days=days - 1)
-    start_dt = _start_of_day(start_date)
 
+    r = CallDailyRollup
     result = await db.execute(
-        select(
-            func.date(Call.time).label("day"),
-            func.count(Call.id).label("count"),
-        )
-        .where(Call.time >= start_dt)
-        .group_by(func.date(Call.time))
-        .order_by(func.date(Call.time))
+        select(r.day, _sum(r.call_count).label("count"))
+        .where(r.day >= start_date)
+        .group_by(r.day)
     )
-    rows = {str(row.day): row.count for row in result}
+    rows = {row.day: row.count for row in result}
 
     daily = []
     for i in range(days):
         d = start_date + timedelta(days=i)
-        daily.append({"date": str(d), "count": rows.get(str(d), 0)})
+        daily.append({"date": str(d), "count": rows.get(d, 0)})
     return daily
 
 
 async def get_urgency_stats(db: AsyncSession) -> list[dict]:
-    total = await db.scalar(select(func.count(Call.id))) or 0
+    r = CallDailyRollup
     result = await db.execute(
-        select(Call.urgency, func.count(Call.id).label("count"))
-        .group_by(Call.urgency)
+        select(r.urgency, _sum(r.call_count).label("count")).group_by(r.urgency)
     )
+    counts = {row.urgency: row.count for row in result}
+    total = sum(counts.values())
+
     stats = []
-    for row in result:
-        pct = round((row.count / total * 100) if total > 0 else 0, 1)
-        stats.append({"urgency": row.urgency, "count": row.count, "percentage": pct})
+    for urgency, count in counts.items():
+        pct = round((count / total * 100) if total > 0 else 0, 1)
+        stats.append({"urgency": urgency, "count": count, "percentage": pct})
 
     # Ensure all urgency levels are present
     present = {s["urgency"] for s in stats}
@@ -152,12 +128,32 @@ async def get_urgency_stats(db: AsyncSession) -> list[dict]:
     return stats
 
 
-async def get_symptom_stats(db: AsyncSession, limit: int = 10) -> list[dict]:
+async def get_symptom_stats(
+    db: AsyncSession,
+    limit: int = 10,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[dict]:
+    if date_from is None and date_to is None:
+        result = await db.execute(
+            select(Symptom.label, Symptom.call_count.label("count"))
+            .where(Symptom.call_count > 0)
+            .order_by(Symptom.call_count.desc(), Symptom.id)
+            .limit(limit)
+        )
+        return [{"symptom": row.label, "count": row.count} for row in result]
+
+    d = SymptomDailyCount
+    count = func.sum(d.call_count)
+    query = select(Symptom.label, count.label("count")).join(Symptom, Symptom.id == d.symptom_id)
+    if date_from is not None:
+        query = query.where(d.day >= date_from)
+    if date_to is not None:
+        query = query.where(d.day <= date_to)
     result = await db.execute(
-        text(
-            "SELECT s AS symptom, COUNT(*) AS count "
-            "FROM calls, unnest(symptoms) AS s "
-            "GROUP BY s ORDER BY count DESC LIMIT :lim"
-        ).bindparams(lim=limit)
+        query.group_by(Symptom.id, Symptom.label)
+        .having(count > 0)
+        .order_by(count.desc(), Symptom.id)
+        .limit(limit)
     )
-    return [{"symptom": row.symptom, "count": row.count} for row in result]
+    return [{"symptom": row.label, "count": row.count} for row in result]
@@ -0,0 +1,102 @@
+"""Normalized symptom dictionary and per-day symptom counters.
+
+Symptoms are free-text LLM output, so they are keyed by a normalized form
+("Fieber", "fieber " -> "fieber") and each call counts at most once per
+symptom. Write paths pass the affected calls' (day, symptoms) to ``apply``
+inside their own transaction. Keys and labels are clipped to the column
+length, so one runaway LLM answer cannot fail the upsert, and with it that
+transaction.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.call import Call
+from app.models.symptom import Symptom, SymptomDailyCount
+from app.services.rollup_service import call_day_sql
+
+REBUILD_BATCH_SIZE = 5000
+MAX_LENGTH = Symptom.__table__.c.key.type.length
+
+
+def normalize(symptom: str) -> str:
+    # lower() can lengthen a string ("İ" -> "i̇"), so clip after it
+    return " ".join(symptom.split()).lower()[:MAX_LENGTH].rstrip()
+
+
+def _labels(symptoms: Iterable[str]) -> dict[str, str]:
+    """Map normalized key -> display label, deduplicated per call."""
+    labels: dict[str, str] = {}
+    for s in symptoms:
+        label = " ".join(s.split())[:MAX_LENGTH].rstrip()
+        if label:
+            labels.setdefault(normalize(label), label)
+    return labels
+
+
+async def apply(
+    db: AsyncSession,
+    *,
+    removed: Iterable[tuple[date, Iterable[str]]] = (),
+    added: Iterable[tuple[date, Iterable[str]]] = (),
+) -> None:
+    totals: dict[str, int] = defaultdict(int)
+    daily: dict[tuple[date, str], int] = defaultdict(int)
+    labels: dict[str, str] = {}
+    for sign, calls in ((-1, removed), (1, added)):
+        for day, symptoms in calls:
+            for key, label in _labels(symptoms).items():
+                labels.setdefault(key, label)
+                totals[key] += sign
+                daily[(day, key)] += sign
+
+    changed = sorted(key for key, delta in totals.items() if delta)
+    changed_daily = sorted(k for k, delta in daily.items() if delta)
+    if not changed and not changed_daily:
+        return
+
+    # Upserting the dictionary row both assigns ids and moves the all-time counter
+    keys = sorted({key for _, key in changed_daily} | set(changed))
+    stmt = pg_insert(Symptom).values(
+        [{"key": key, "label": labels[key], "call_count": totals[key]} for key in keys]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Symptom.key],
+        set_={"call_count": Symptom.call_count + stmt.excluded.call_count},
+    ).returning(Symptom.id, Symptom.key)
+    ids = {row.key: row.id for row in await db.execute(stmt)}
+
+    if changed_daily:
+        stmt = pg_insert(SymptomDailyCount).values([
+            {"day": day, "symptom_id": ids[key], "call_count": daily[(day, key)]}
+            for day, key in changed_daily
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SymptomDailyCount.day, SymptomDailyCount.symptom_id],
+            set_={"call_count": SymptomDailyCount.call_count + stmt.excluded.call_count},
+        )
+        await db.execute(stmt)
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """Recompute all counters from calls. Blocks call writers until commit."""
+    await db.execute(text("LOCK TABLE calls IN SHARE MODE"))
+    await db.execute(delete(SymptomDailyCount))
+    await db.execute(update(Symptom).values(call_count=0))
+
+    counted = 0
+    result = await db.stream(
+        select(call_day_sql(), Call.symptoms)
+        .where(func.cardinality(Call.symptoms) > 0)
+        .execution_options(yield_per=REBUILD_BATCH_SIZE)
+    )
+    async for batch in result.partitions():
+        await apply(db, added=[(day, symptoms) for day, symptoms in batch])
+        counted += len(batch)
+    return counted
+
@@ -0,0 +1,92 @@
+"""Instant keyword pre-triage of transcripts, ahead of the LLM analysis.
+
+The criteria mirror the "high" list of ``ANALYSIS_SYSTEM_PROMPT``. Each has
+a few literal anchors and a precompiled pattern: the anchors are found with
+``str.find`` (a C substring scan), and the pattern only runs in a small
+window around each hit. A full regex scan of every position is several times
+slower in ``re``, which has no multi-pattern automaton. A classification
+costs microseconds, so it can run on every transcript, or partial
+transcript, as soon as it exists. Only "high" is ever flagged; the LLM
+result replaces the urgency when it lands.
+"""
+
+import re
+from typing import NamedTuple
+
+HIGH = "high"
+
+
+class Criterion(NamedTuple):
+    anchors: tuple[str, ...]
+    pattern: str
+
+
+# Matched against the lower-cased text; every pattern match contains one of its anchors
+HIGH_URGENCY_CRITERIA = {
+    "brustschmerzen": Criterion(
+        ("brust", "herzinfarkt"),
+        r"\bbrust\w*[- ]?schmerz|\bschmerz\w* (?:in|an|auf) der brust|\b(?:druck|enge\w*) (?:in|auf) der brust"
+        r"|\bherzinfarkt",
+    ),
+    "atemnot": Criterion(
+        ("atem", "atm", "luft", "erstick"),
+        r"\b(?:atemnot|luftnot|atembeschwerden|kurzatmig)|\b(?:bekomm|krieg)\w* (?:kaum|keine) luft"
+        r"|\bkann (?:kaum|nicht) (?:mehr )?atmen|\berstick",
+    ),
+    "blutung": Criterion(
+        ("blut",),
+        r"\b(?:stark|heftig|schwer)\w* blutung|\bblutet (?:sehr|stark|heftig)"
+        r"|\bblutung\w* (?:hört|lässt) (?:sich )?nicht|\bbluterbrechen|\bblut (?:erbrochen|gespuckt)",
+    ),
+    "bewusstlosigkeit": Criterion(
+        ("bewusst", "ohnm", "ansprechbar", "kollab", "zusammengebr"),
+        r"\bbewusstlos|\bbewusstsein verloren|\bohnm(?:acht|ächtig)|\bnicht (?:mehr )?ansprechbar"
+        r"|\bkollabiert|\bzusammengebrochen",
+    ),
+    "allergische_reaktion": Criterion(
+        ("allerg", "anaphylak", "schwellung", "geschwollen"),
+        r"\ballergisch\w* (?:reaktion|schock)|\banaphylak|\bschwellung (?:im gesicht|der zunge|im hals)"
+        r"|\b(?:zunge|gesicht|hals|lippen?) (?:ist |sind )?(?:an)?geschwollen",
+    ),
+    # Not named in the prompt, but equally "lebensbedrohlich"
+    "schlaganfall": Criterion(
+        ("schlaganfall", "lähm", "mundwinkel"),
+        r"\bschlaganfall|\bhalbseitig\w* gelähmt|\blähmung|\bhängend\w* mundwinkel",
+    ),
+    "krampfanfall": Criterion(("anfall",), r"\bkrampfanfall|\bepileptisch\w* anfall"),
+}
+
+# How far around an anchor hit its pattern (and a negation) may reach
+WINDOW = 40
+
+_criteria = [
+    (label, criterion.anchors, re.compile(criterion.pattern))
+    for label, criterion in HIGH_URGENCY_CRITERIA.items()
+]
+# "keine Atembeschwerden", "ohne Brustschmerzen": a negation up to two words before the match
+_negation = re.compile(r"\b(?:kein\w*|ohne|nicht|verneint)\s+(?:\w+\s+){0,2}$")
+
+
+class Triage(NamedTuple):
+    urgency: str | None
+    reasons: tuple[str, ...]
+
+
+def _matches(text: str, anchors: tuple[str, ...], pattern: re.Pattern) -> bool:
+    for anchor in anchors:
+        i = text.find(anchor)
+        while i >= 0:
+            for match in pattern.finditer(text, max(0, i - WINDOW), i + len(anchor) + WINDOW):
+                if not _negation.search(text, max(0, match.start() - WINDOW), match.start()):
+                    return True
+            i = text.find(anchor, i + 1)
+    return False
+
+
+def classify(text: str) -> Triage:
+    """Flag ``text`` as high urgency if any criterion matches un-negated."""
+    lowered = text.lower()
+    reasons = tuple(
+        label for label, anchors, pattern in _criteria if _matches(lowered, anchors, pattern)
+    )
+    return Triage(HIGH if reasons else None, reasons)
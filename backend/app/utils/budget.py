@@ -0,0 +1,21 @@
+class ByteBudget:
+    """Non-blocking counter of bytes held against a fixed limit.
+
+    ``try_acquire`` either reserves the bytes at once or refuses, so callers
+    pick a fallback (such as spilling to disk) instead of waiting on each
+    other.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+
+    def try_acquire(self, n: int) -> bool:
+        """Reserve ``n`` only if it fits right now; never exceeds the limit."""
+        if self.in_use + n > self.limit:
+            return False
+        self.in_use += n
+        return True
+
+    def release(self, n: int) -> None:
+        self.in_use -= n
@@ -1,10 +1,19 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import TypeVar
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session
 
+T = TypeVar("T")
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+async def run_in_session(fn: Callable[..., Awaitable[T]], /, *args, **kwargs) -> T:
+    """Run ``fn(db, ...)`` on its own pooled session, so queries can run concurrently."""
+    async with async_session() as session:
+        return await fn(session, *args, **kwargs)
@@ -0,0 +1,64 @@
+"""ETags for conditional GETs (If-None-Match) and PATCH preconditions (If-Match).
+
+Single calls get a strong tag from ``(id, updated_at)``. Collections and stats
+get a weak tag from the data version plus the request's path and query, since
+any committed write bumps the version.
+"""
+
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import HTTPException, Request, Response
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _split(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def row_etag(row_id: int, updated_at: datetime) -> str:
+    return f'"{row_id}-{(updated_at - _EPOCH) // _MICROSECOND}"'
+
+
+def collection_etag(request: Request, version: int, day: date | None = None) -> str:
+    """Weak ETag of a collection at data ``version``; ``day`` for views relative to today."""
+    params = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(repr((request.url.path, params, day)).encode(), digest_size=8)
+    return f'W/"{version}-{digest.hexdigest()}"'
+
+
+def none_match(request: Request, tag: str) -> bool:
+    """True if If-None-Match matches ``tag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    bare = tag.removeprefix("W/")
+    return any(t == "*" or t.removeprefix("W/") == bare for t in _split(header))
+
+
+def not_modified(request: Request, response: Response, tag: str) -> None:
+    """Raise 304 if the client already has ``tag``, otherwise attach it to the response."""
+    if none_match(request, tag):
+        raise HTTPException(status_code=304, headers={"ETag": tag})
+    response.headers["ETag"] = tag
+    # Let browsers keep the body but revalidate on every use
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def if_match_versions(header: str, row_id: int) -> list[datetime] | None:
+    """``updated_at`` values an If-Match header accepts for a call; None means ``*``.
+
+    If-Match uses strong comparison, so weak and foreign tags never match.
+    """
+    tags = _split(header)
+    if "*" in tags:
+        return None
+    prefix = f'"{row_id}-'
+    versions = []
+    for tag in tags:
+        micros = tag[len(prefix):-1]
+        if tag.startswith(prefix) and tag.endswith('"') and micros.isdigit():
+            versions.append(_EPOCH + int(micros) * _MICROSECOND)
+    return versions
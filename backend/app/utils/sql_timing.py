@@ -0,0 +1,108 @@
+"""Per-request SQL query counts and time, and a slow-query log with plans.
+
+``install`` hooks the engine's cursor events. Inside ``track()`` every
+statement, on any session or connection of the current task and the tasks
+it spawns, adds to the yielded ``QueryStats``. Statements slower than
+``slow_query_ms`` are logged; with ``slow_query_explain`` the log line
+carries the ``EXPLAIN`` plan, fetched on a separate pooled connection after
+the fact so the slow request itself is not held up. Each statement is
+explained at most once per ``EXPLAIN_INTERVAL_SECONDS``.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_INTERVAL_SECONDS = 300.0
+MAX_EXPLAINED_STATEMENTS = 1000
+# EXPLAIN without ANALYZE plans these without running them
+EXPLAINABLE = {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE"}
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_explained: dict[str, float] = {}
+_tasks: set[asyncio.Task] = set()
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+async def _explain(engine: AsyncEngine, statement: str, parameters, elapsed: float) -> None:
+    _current.set(None)  # the EXPLAIN is not the request's own query
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(row[0] for row in result)
+    except Exception as exc:
+        plan = f"(EXPLAIN failed: {exc!r})"
+    logger.warning("Slow query (%.0f ms): %s\n%s", elapsed * 1000, statement, plan)
+
+
+def _slow(engine: AsyncEngine, statement: str, parameters, elapsed: float, executemany: bool) -> None:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    now = time.monotonic()
+    explain = (
+        settings.slow_query_explain
+        and not executemany
+        and keyword in EXPLAINABLE
+        and now - _explained.get(statement, float("-inf")) >= EXPLAIN_INTERVAL_SECONDS
+    )
+    if not explain:
+        logger.warning("Slow query (%.0f ms): %s", elapsed * 1000, statement)
+        return
+    if len(_explained) >= MAX_EXPLAINED_STATEMENTS:
+        _explained.clear()
+    _explained[statement] = now
+    if not isinstance(parameters, dict):
+        parameters = tuple(parameters or ())
+    task = asyncio.get_running_loop().create_task(_explain(engine, statement, parameters, elapsed))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def install(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+        if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+            _slow(engine, statement, parameters, elapsed, executemany)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        # A failed statement never reaches after_cursor_execute
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
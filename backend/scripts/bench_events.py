@@ -0,0 +1,67 @@
+"""Load-test GET /api/events: many SSE subscribers, fan-out latency per write.
+
+Needs a running server and an existing call. Each round toggles the call's
+status twice (leaving it as it was) and measures how long every subscriber
+takes to see the resulting event.
+
+    python -m scripts.bench_events --url http://localhost:8000 --clients 500 --call-id 1
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+async def _subscriber(client: httpx.AsyncClient, url: str, ready: asyncio.Event,
+                      received: dict[int, list[float]]) -> None:
+    async with client.stream("GET", f"{url}/api/events") as response:
+        ready.set()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                event = json.loads(line.removeprefix("data: "))
+                if event.get("version") is not None:
+                    received.setdefault(event["version"], []).append(time.perf_counter())
+
+
+async def bench(url: str, clients: int, call_id: int, rounds: int) -> None:
+    limits = httpx.Limits(max_connections=clients + 10)
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        received: dict[int, list[float]] = {}
+        readies = [asyncio.Event() for _ in range(clients)]
+        tasks = [asyncio.create_task(_subscriber(client, url, r, received)) for r in readies]
+        await asyncio.gather(*(r.wait() for r in readies))
+        await asyncio.sleep(0.5)  # let the server register every subscription
+
+        latencies = []
+        for _ in range(rounds * 2):
+            sent = time.perf_counter()
+            await client.patch(f"{url}/api/calls/{call_id}/status")
+            await asyncio.sleep(0.5)
+            # Each write bumps the version once; take the newest event's arrivals
+            arrivals = received.pop(max(received), []) if received else []
+            latencies.extend((t - sent) * 1000 for t in arrivals)
+            received.clear()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    expected = clients * rounds * 2
+    print(f"{clients} subscribers, {rounds * 2} writes: {len(latencies)}/{expected} events delivered")
+    if latencies:
+        q = statistics.quantiles(latencies, n=100)
+        print(f"  fan-out latency p50 {q[49]:.1f} ms, p99 {q[98]:.1f} ms, max {max(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--call-id", type=int, required=True)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(bench(args.url, args.clients, args.call_id, args.rounds))
@@ -0,0 +1,67 @@
+"""Benchmark the streaming call export: time to first chunk and peak RSS.
+
+Synthetic calls are generated inside a transaction that is rolled back at the
+end, so the benchmark never leaves data behind. Run one size per process so
+the peak RSS reading is not inherited from a previous run.
+
+    python -m scripts.bench_export --rows 1000000 --format ndjson
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.services import call_service, export_service
+from scripts.bench_stats import GENERATE_CALLS
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _aenumerate(iterator):
+    i = 0
+    async for item in iterator:
+        yield i, item
+        i += 1
+
+
+async def bench(rows: int, fmt: str) -> None:
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.execute(GENERATE_CALLS.bindparams(n=rows))
+            db = AsyncSession(bind=conn)
+            fields = call_service.EXPORT_FIELDS
+            baseline = _peak_rss_mb()
+
+            started = time.perf_counter()
+            first_chunk_ms = None
+            size = 0
+            batches = call_service.stream_rows(db, call_service.export_query(fields=fields))
+            header_chunks = 1 if fmt == "csv" else 0
+            chunks = export_service.encode(batches, fields, fmt)
+            async for i, chunk in _aenumerate(chunks):
+                if first_chunk_ms is None and i >= header_chunks:
+                    first_chunk_ms = (time.perf_counter() - started) * 1000
+                size += len(chunk)
+            total_s = time.perf_counter() - started
+
+            print(f"{rows} rows as {fmt}: {size / 2**20:.1f} MiB in {total_s:.2f}s")
+            print(f"  first rows after {first_chunk_ms or 0:.1f} ms")
+            print(f"  peak RSS {_peak_rss_mb():.0f} MiB (before export {baseline:.0f} MiB)")
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=sorted(export_service.MEDIA_TYPES), default="csv")
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.format))
@@ -0,0 +1,87 @@
+"""Benchmark deep-page latency of GET /api/calls: offset vs. keyset pagination.
+
+Both columns time ``call_service.get_calls`` itself, once with ``skip`` and
+once with the ``cursor`` a client would hold after reading the previous page,
+so cursor decoding, the keyset condition and the sort whitelist are all part
+of the measurement. Each page is also checked to come back identical both
+ways. Synthetic calls are generated inside a transaction that is rolled back
+at the end, so the benchmark never leaves data behind.
+
+    python -m scripts.bench_pagination --rows 1000000 --pages 1 50 500 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.services import call_service
+from scripts.bench_stats import GENERATE_CALLS
+
+PAGE_SIZE = 10
+
+
+async def _median_ms(fetch, repeat: int) -> tuple[float, call_service.CallsPage]:
+    result = await fetch()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fetch()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+async def bench(rows: int, pages: list[int], repeat: int, sort: str, order: str, count_mode: str) -> None:
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.execute(GENERATE_CALLS.bindparams(n=rows))
+            await conn.execute(text("ANALYZE calls"))
+            db = AsyncSession(bind=conn)
+
+            def fetch(**kwargs):
+                return lambda: call_service.get_calls(
+                    db, limit=PAGE_SIZE, sort=sort, order=order, count_mode=count_mode, **kwargs,
+                )
+
+            print(f"{rows} rows, page size {PAGE_SIZE}, sort {sort} {order}, count {count_mode}")
+            print(f"{'page':>8}  {'offset ms':>10}  {'keyset ms':>10}")
+            for page in pages:
+                skip = (page - 1) * PAGE_SIZE
+                cursor = None
+                if skip:
+                    # The cursor a client would hold after reading the previous page
+                    previous = await call_service.get_calls(
+                        db, skip=skip - PAGE_SIZE, limit=PAGE_SIZE, sort=sort, order=order, count_mode="none",
+                    )
+                    if previous.next_cursor is None:
+                        print(f"{page:>8}  (past the last page)")
+                        continue
+                    cursor = previous.next_cursor
+                offset_ms, by_offset = await _median_ms(fetch(skip=skip), repeat)
+                keyset_ms, by_cursor = await _median_ms(fetch(cursor=cursor), repeat)
+                if [c["id"] for c in by_offset.calls] != [c["id"] for c in by_cursor.calls]:
+                    raise SystemExit(f"Page {page} differs between offset and cursor pagination")
+                print(f"{page:>8}  {offset_ms:>10.2f}  {keyset_ms:>10.2f}")
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 50, 500, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sort", choices=sorted(call_service.SORT_COLUMNS), default="time")
+    parser.add_argument("--order", choices=("desc", "asc"), default="desc")
+    parser.add_argument(
+        "--count-mode", choices=("none", "estimate", "exact"), default="none",
+        help="total computed per request; 'exact' adds the same COUNT to both columns",
+    )
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.pages, args.repeat, args.sort, args.order, args.count_mode))
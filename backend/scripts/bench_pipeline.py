@@ -0,0 +1,140 @@
+"""Benchmark recording pipeline latency: per-call clients vs. shared pooled clients.
+
+Starts a local stub server for the recording download and the OpenAI
+transcription and chat endpoints, then runs download -> transcribe ->
+analyze for every recording twice: once building new clients per step (the
+old behaviour) and once through ``app.services.clients``. Pass a certificate
+for localhost to include TLS handshakes, which dominate over real networks.
+
+    python -m scripts.bench_pipeline --recordings 200 --concurrency 8
+    python -m scripts.bench_pipeline --certfile localhost.pem --keyfile localhost-key.pem
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+import httpx
+import uvicorn
+from openai import AsyncOpenAI
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from app.config import settings
+from app.services import clients, openai_service
+
+PORT = 8765
+AUDIO = b"\0" * 64_000
+ANALYSIS = {
+    "name": "Bench", "summary": "Stub", "symptoms": ["Fieber"],
+    "urgency": "medium", "callback_requested": False,
+}
+
+
+def _stub_app(delay: float) -> Starlette:
+    async def recording(request):
+        await asyncio.sleep(delay)
+        return Response(AUDIO, media_type="audio/wav")
+
+    async def transcription(request):
+        await request.body()
+        await asyncio.sleep(delay)
+        return JSONResponse({"text": "Ich habe seit gestern Fieber."})
+
+    async def chat(request):
+        await request.body()
+        await asyncio.sleep(delay)
+        return JSONResponse({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(ANALYSIS)},
+            }],
+        })
+
+    return Starlette(routes=[
+        Route("/recordings/{id}.wav", recording),
+        Route("/v1/audio/transcriptions", transcription, methods=["POST"]),
+        Route("/v1/chat/completions", chat, methods=["POST"]),
+    ])
+
+
+async def _fresh_pipeline(base: str, n: int) -> None:
+    """What every recording used to do: a new client for each step."""
+    async with httpx.AsyncClient() as client:
+        audio = (await client.get(f"{base}/recordings/{n}.wav")).content
+    async with AsyncOpenAI(api_key="stub", base_url=f"{base}/v1") as ai:
+        transcript = (await ai.audio.transcriptions.create(
+            model="whisper-1", file=("recording.wav", audio), language="de",
+        )).text
+    async with AsyncOpenAI(api_key="stub", base_url=f"{base}/v1") as ai:
+        await ai.chat.completions.create(
+            model="stub", messages=[{"role": "user", "content": transcript}],
+        )
+
+
+async def _pooled_pipeline(base: str, n: int) -> None:
+    audio = (await clients.http().get(f"{base}/recordings/{n}.wav")).content
+    transcript = await openai_service.transcribe_audio(audio)
+    await openai_service.analyze_transcript(transcript)
+
+
+async def _measure(pipeline, base: str, recordings: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(n: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await pipeline(base, n)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one(n) for n in range(recordings)))
+    return samples
+
+
+async def bench(recordings: int, concurrency: int, delay_ms: float, certfile, keyfile) -> None:
+    scheme = "https" if certfile else "http"
+    base = f"{scheme}://localhost:{PORT}"
+    if certfile:
+        os.environ["SSL_CERT_FILE"] = certfile  # trusted by every httpx client below
+    settings.openai_api_key = "stub"
+    settings.openai_base_url = f"{base}/v1"
+
+    server = uvicorn.Server(uvicorn.Config(
+        _stub_app(delay_ms / 1000), port=PORT, log_level="warning",
+        ssl_certfile=certfile, ssl_keyfile=keyfile,
+    ))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        print(f"{recordings} recordings, concurrency {concurrency}, {scheme}, stub delay {delay_ms} ms")
+        print(f"{'clients':<8}  {'p50 ms':>8}  {'p95 ms':>8}  {'total s':>8}")
+        for label, pipeline in (("fresh", _fresh_pipeline), ("pooled", _pooled_pipeline)):
+            await pipeline(base, -1)  # warm-up (imports, first connection)
+            started = time.perf_counter()
+            samples = await _measure(pipeline, base, recordings, concurrency)
+            total = time.perf_counter() - started
+            q = statistics.quantiles(samples, n=20)
+            print(f"{label:<8}  {statistics.median(samples):>8.1f}  {q[18]:>8.1f}  {total:>8.2f}")
+    finally:
+        await clients.close()
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recordings", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--delay-ms", type=float, default=5.0)
+    parser.add_argument("--certfile")
+    parser.add_argument("--keyfile")
+    args = parser.parse_args()
+    asyncio.run(bench(args.recordings, args.concurrency, args.delay_ms, args.certfile, args.keyfile))
@@ -0,0 +1,97 @@
+"""Benchmark date-range PDF reports: render time, peak RSS, output size.
+
+Each size runs in a fresh process so peak RSS readings are independent.
+Synthetic calls are generated inside a transaction that is rolled back at the
+end, so the benchmark never leaves data behind. ``--compare`` also renders
+the same rows the old way (all rows in one in-memory Table).
+
+    python -m scripts.bench_report --rows 100 10000 100000 --compare
+"""
+
+import argparse
+import asyncio
+import io
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.services import call_service, pdf_service
+from app.services.pdf_service import ReportRow
+from scripts.bench_stats import GENERATE_CALLS
+
+# GENERATE_CALLS spreads rows over the last 120 days
+DATE_TO = date.today()
+DATE_FROM = DATE_TO - timedelta(days=120)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _bench_one(rows: int, legacy: bool) -> dict:
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.execute(GENERATE_CALLS.bindparams(n=rows))
+            db = AsyncSession(bind=conn)
+            query = call_service.export_query(
+                date_from=DATE_FROM, date_to=DATE_TO, sort="time", order="asc",
+                fields=ReportRow._fields,
+            )
+            baseline = _peak_rss_mb()
+            started = time.perf_counter()
+            if legacy:
+                calls = [ReportRow(**row) for row in (await db.execute(query)).mappings()]
+                buffer = io.BytesIO()
+                SimpleDocTemplate(buffer, pagesize=A4).build([pdf_service._call_table(calls)])
+                size, pages = buffer.tell(), None
+            else:
+                with tempfile.TemporaryFile() as out:
+                    report = pdf_service.RangeReport(out, DATE_FROM, DATE_TO, {})
+                    async for batch in call_service.stream_rows(db, query):
+                        report.add_rows(ReportRow(**row) for row in batch)
+                    report.finish()
+                    size, pages = out.tell(), report.page - 1
+            return {
+                "seconds": time.perf_counter() - started,
+                "rss_mb": _peak_rss_mb() - baseline,
+                "size_mb": size / 2**20,
+                "pages": pages,
+            }
+        finally:
+            await trans.rollback()
+            await engine.dispose()
+
+
+def _run(rows: int, legacy: bool) -> dict:
+    return asyncio.run(_bench_one(rows, legacy))
+
+
+def bench(sizes: list[int], compare: bool) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'rows':>8}  {'mode':<11}  {'seconds':>8}  {'+RSS MiB':>9}  {'PDF MiB':>8}  {'pages':>6}")
+    for rows in sizes:
+        for legacy in (False, True) if compare else (False,):
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                r = pool.submit(_run, rows, legacy).result()
+            mode = "in-memory" if legacy else "incremental"
+            print(
+                f"{rows:>8}  {mode:<11}  {r['seconds']:>8.2f}  {r['rss_mb']:>9.1f}  "
+                f"{r['size_mb']:>8.2f}  {r['pages'] if r['pages'] is not None else '-':>6}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--compare", action="store_true")
+    args = parser.parse_args()
+    bench(args.rows, args.compare)
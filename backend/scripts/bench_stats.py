@@ -0,0 +1,133 @@
+"""Benchmark /api/stats: the rollup-backed query vs. the old eight-query version.
+
+Synthetic calls are generated inside a transaction that is rolled back at the
+end, so the benchmark never leaves data behind.
+
+    python -m scripts.bench_stats --rows 10000 1000000 10000000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.models.call import Call
+from app.services import rollup_service, stats_service
+from app.utils.duration import format_duration, parse_duration_seconds
+
+GENERATE_CALLS = text(
+    "INSERT INTO calls (name, phone, urgency, time, duration, summary, status, symptoms) "
+    "SELECT 'Bench ' || g, '+43 660 ' || g, "
+    "(ARRAY['high', 'medium', 'low'])[1 + g % 3], "
+    "now() - (g % 120) * interval '1 day' - (g % 86400) * interval '1 second', "
+    "'00:' || lpad(((g % 10))::text, 2, '0') || ':' || lpad((g % 60)::text, 2, '0'), "
+    "'', (ARRAY['unread', 'read'])[1 + g % 2], '{}' "
+    "FROM generate_series(1, :n) AS g"
+)
+
+
+def _start_of_day(d: date) -> datetime:
+    return datetime.combine(d, dtime.min, tzinfo=timezone.utc)
+
+
+def _end_of_day(d: date) -> datetime:
+    return datetime.combine(d, dtime.max, tzinfo=timezone.utc)
+
+
+async def legacy_get_stats(db: AsyncSession) -> dict:
+    """The pre-aggregate implementation, kept here as the comparison baseline."""
+    today = stats_service.utc_today()  # the day get_stats reports on
+    yesterday = today - timedelta(days=1)
+    today_start, today_end = _start_of_day(today), _end_of_day(today)
+    yesterday_start, yesterday_end = _start_of_day(yesterday), _end_of_day(yesterday)
+    month_start_dt = _start_of_day(today.replace(day=1))
+
+    today_calls = await db.scalar(
+        select(func.count(Call.id)).where(Call.time.between(today_start, today_end))
+    ) or 0
+    urgent_calls = await db.scalar(
+        select(func.count(Call.id)).where(
+            Call.time.between(today_start, today_end), Call.urgency == "high"
+        )
+    ) or 0
+    yesterday_calls = await db.scalar(
+        select(func.count(Call.id)).where(Call.time.between(yesterday_start, yesterday_end))
+    ) or 0
+    month_calls = await db.scalar(
+        select(func.count(Call.id)).where(Call.time >= month_start_dt)
+    ) or 0
+    unhandled_urgent = await db.scalar(
+        select(func.count(Call.id)).where(Call.urgency == "high", Call.status == "unread")
+    ) or 0
+    total_calls = await db.scalar(select(func.count(Call.id))) or 0
+    total_urgent = await db.scalar(
+        select(func.count(Call.id)).where(Call.urgency == "high")
+    ) or 0
+
+    today_durs = [r[0] for r in await db.execute(
+        select(Call.duration).where(Call.time.between(today_start, today_end))
+    )]
+    yesterday_durs = [r[0] for r in await db.execute(
+        select(Call.duration).where(Call.time.between(yesterday_start, yesterday_end))
+    )]
+
+    def _avg(durs: list[str]) -> str:
+        if not durs:
+            return "00:00:00"
+        return format_duration(sum(parse_duration_seconds(d) for d in durs) // len(durs))
+
+    return {
+        "today_calls": today_calls,
+        "urgent_calls": urgent_calls,
+        "avg_duration": _avg(today_durs),
+        "month_calls": month_calls,
+        "yesterday_calls": yesterday_calls,
+        "unhandled_urgent": unhandled_urgent,
+        "avg_duration_yesterday": _avg(yesterday_durs),
+        "urgent_percentage": round((total_urgent / total_calls * 100) if total_calls > 0 else 0, 1),
+    }
+
+
+async def _time(fn, db: AsyncSession, repeat: int) -> tuple[float, dict]:
+    result = await fn(db)  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fn(db)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+async def bench(rows: list[int], repeat: int) -> None:
+    print(f"{'rows':>10}  {'legacy ms':>10}  {'rollup ms':>14}  {'speedup':>8}")
+    for n in rows:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                await conn.execute(GENERATE_CALLS.bindparams(n=n))
+                db = AsyncSession(bind=conn)
+                await rollup_service.rebuild(db)
+                await conn.execute(text("ANALYZE calls"))
+                day = stats_service.utc_today()
+                legacy_ms, legacy = await _time(legacy_get_stats, db, repeat)
+                new_ms, new = await _time(stats_service.get_stats, db, repeat)
+                # Across a UTC midnight the two legitimately report different days
+                if legacy != new and stats_service.utc_today() == day:
+                    raise SystemExit(f"Result mismatch at {n} rows:\n{legacy}\n{new}")
+                print(f"{n:>10}  {legacy_ms:>10.1f}  {new_ms:>14.1f}  {legacy_ms / new_ms:>7.1f}x")
+            finally:
+                await trans.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.repeat))
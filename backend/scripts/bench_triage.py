@@ -0,0 +1,70 @@
+"""Benchmark keyword pre-triage throughput: compiled regex vs. naive substring scan.
+
+Texts are the seed summaries, and synthetic transcripts of ``--chars``
+characters built from them. The naive baseline lower-cases the text and
+searches for each keyword in turn, which is what a first version would do.
+
+    python -m scripts.bench_triage --chars 3000 --seconds 2
+"""
+
+import argparse
+import itertools
+import time
+
+from app.services import triage_service
+from scripts.seed import SEED_CALLS
+
+NAIVE_KEYWORDS = (
+    "brustschmerz", "schmerzen in der brust", "herzinfarkt", "atemnot", "luftnot", "keine luft",
+    "starke blutung", "blutet stark", "bewusstlos", "ohnmächtig", "nicht ansprechbar",
+    "allergische reaktion", "anaphylak", "schlaganfall", "lähmung", "krampfanfall",
+)
+
+
+def naive_classify(text: str) -> bool:
+    lowered = text.lower()
+    return any(keyword in lowered for keyword in NAIVE_KEYWORDS)
+
+
+def compiled_classify(text: str) -> bool:
+    return triage_service.classify(text).urgency is not None
+
+
+def _transcripts(chars: int) -> list[str]:
+    summaries = [call["summary"] for call in SEED_CALLS]
+    out = []
+    for n in range(len(summaries)):
+        # Rotate so each transcript has a different mix, then pad to length
+        parts = itertools.cycle(summaries[n:] + summaries[:n])
+        text = ""
+        while len(text) < chars:
+            text += next(parts) + " "
+        out.append(text[:chars])
+    return out
+
+
+def _rate(fn, texts: list[str], seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        for text in texts:
+            fn(text)
+        count += len(texts)
+    return count / elapsed
+
+
+def bench(chars: int, seconds: float) -> None:
+    sets = (("summaries", [call["summary"] for call in SEED_CALLS]), (f"{chars} chars", _transcripts(chars)))
+    print(f"{'texts':<12}  {'naive /s':>12}  {'compiled /s':>12}  {'compiled us':>12}")
+    for label, texts in sets:
+        naive = _rate(naive_classify, texts, seconds)
+        compiled = _rate(compiled_classify, texts, seconds)
+        print(f"{label:<12}  {naive:>12,.0f}  {compiled:>12,.0f}  {1e6 / compiled:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=3000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    bench(args.chars, args.seconds)
@@ -0,0 +1,68 @@
+"""Assert via EXPLAIN that every supported GET /api/calls shape reads an index in order.
+
+Synthetic calls are generated inside a transaction that is rolled back at the
+end, so the check never leaves data behind. Exits non-zero if any supported
+filter/sort shape does not use an index, or sorts rows itself (a ``Sort`` or
+``Incremental Sort`` node anywhere in the plan, e.g. above a bitmap scan)
+instead of reading them in index order and stopping at the page size.
+
+    python -m scripts.check_query_plans --rows 200000
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.call_service import SORT_COLUMNS, list_query
+from app.utils.explain import Explain, parse_plan
+from scripts.bench_stats import GENERATE_CALLS
+
+PAGE_SIZE = 10
+# Bitmap scans return rows in physical order, so only these can feed the LIMIT sorted
+ORDERED_INDEX_NODES = {"Index Scan", "Index Only Scan"}
+SORT_NODES = {"Sort", "Incremental Sort"}
+
+
+def _nodes(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", ()):
+        nodes += _nodes(child)
+    return nodes
+
+
+async def check(rows: int) -> bool:
+    failures = 0
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.execute(GENERATE_CALLS.bindparams(n=rows))
+            await conn.execute(text("ANALYZE calls"))
+
+            shapes = itertools.product(
+                (None, "unread", "read"), (None, "high", "low"), SORT_COLUMNS, ("desc", "asc"),
+            )
+            for status, urgency, sort, order in shapes:
+                query = list_query(status=status, urgency=urgency, sort=sort, order=order)
+                plan = parse_plan(await conn.scalar(Explain(query.limit(PAGE_SIZE + 1))))
+                nodes = _nodes(plan)
+                types = {node["Node Type"] for node in nodes}
+                indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+                ok = bool(types & ORDERED_INDEX_NODES) and not types & SORT_NODES
+                failures += not ok
+                label = f"status={status} urgency={urgency} sort={sort} {order}"
+                print(f"{'ok  ' if ok else 'FAIL'} {label:<55} {', '.join(sorted(types))} [{', '.join(indexes)}]")
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+    return failures == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(check(args.rows)) else 1)
@@ -0,0 +1,163 @@
+"""Measure peak memory of concurrent recording pipelines: buffered vs. streamed.
+
+A stub server (in a separate process, so it is not measured) serves
+recordings and accepts transcription uploads. ``--concurrency`` pipelines
+then download and upload ``--mb`` MiB recordings at once, first the old way
+(whole WAV as bytes), then through ``recording_service.download``. Peak
+Python heap is measured with tracemalloc.
+
+A second round streams ``--small-kb`` KiB recordings, which must stay in
+memory through the upload. Exits non-zero if the streamed peak exceeds the
+memory budget plus per-pipeline chunk buffers, if a large recording was held
+in memory or a small one went to disk, or if the memory budget was ever
+overdrawn or is not fully given back.
+
+    python -m scripts.check_recording_memory --mb 10 --small-kb 256 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import io
+import multiprocessing
+import sys
+import tracemalloc
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.config import settings
+from app.services import clients, openai_service, recording_service
+
+PORT = 8766
+CHUNK = 64 * 1024
+MiB = 1024 * 1024
+
+
+def _serve(large_size: int, small_size: int) -> None:
+    async def recording(request):
+        size = small_size if request.path_params["n"].startswith("small") else large_size
+
+        async def body():
+            for offset in range(0, size, CHUNK):
+                yield b"\0" * min(CHUNK, size - offset)
+        return StreamingResponse(body(), media_type="audio/wav", headers={"Content-Length": str(size)})
+
+    async def transcription(request):
+        async for _ in request.stream():
+            pass
+        return JSONResponse({"text": "stub"})
+
+    app = Starlette(routes=[
+        Route("/recordings/{n}.wav", recording),
+        Route("/v1/audio/transcriptions", transcription, methods=["POST"]),
+    ])
+    uvicorn.run(app, port=PORT, log_level="warning")
+
+
+async def _buffered(url: str) -> None:
+    resp = await clients.http().get(url)
+    resp.raise_for_status()
+    await openai_service.transcribe_audio(resp.content)
+
+
+class _Streamed:
+    """Streamed pipeline that records where each recording was kept."""
+
+    def __init__(self):
+        self.in_memory: list[bool] = []
+
+    async def __call__(self, url: str) -> None:
+        async with recording_service.download(url) as recording:
+            await openai_service.transcribe_audio(recording.file)
+            # Still the same in-memory buffer after the upload read it
+            self.in_memory.append(recording.in_memory and isinstance(recording.file, io.BytesIO))
+
+
+async def _peak_mb(pipeline, concurrency: int, prefix: str = "") -> tuple[float, int]:
+    """Peak heap growth in MiB, and the most budget bytes held at once."""
+    budget = recording_service.memory_budget
+    peak_reserved = 0
+
+    async def watch_budget() -> None:
+        nonlocal peak_reserved
+        while True:
+            peak_reserved = max(peak_reserved, budget.in_use)
+            await asyncio.sleep(0.001)
+
+    watcher = asyncio.create_task(watch_budget())
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        await asyncio.gather(*(
+            pipeline(f"http://localhost:{PORT}/recordings/{prefix}{n}.wav") for n in range(concurrency)
+        ))
+    finally:
+        watcher.cancel()
+    return (tracemalloc.get_traced_memory()[1] - baseline) / MiB, peak_reserved
+
+
+async def check(mb: int, small_kb: int, concurrency: int) -> bool:
+    settings.openai_api_key = "stub"
+    settings.openai_base_url = f"http://localhost:{PORT}/v1"
+    budget = recording_service.memory_budget
+    large, small = _Streamed(), _Streamed()
+    try:
+        await _Streamed()(f"http://localhost:{PORT}/recordings/warmup.wav")  # imports, connections
+        tracemalloc.start()
+        buffered, _ = await _peak_mb(_buffered, concurrency)
+        streamed, large_reserved = await _peak_mb(large, concurrency)
+        _, small_reserved = await _peak_mb(small, concurrency, prefix="small")
+    finally:
+        tracemalloc.stop()
+        await clients.close()
+
+    # Bytes in memory are capped by the budget; each pipeline also holds a few chunk buffers
+    bound = (budget.limit + concurrency * 4 * CHUNK) / MiB
+    small_fit = concurrency * small_kb * 1024 <= budget.limit
+    checks = {
+        "streamed peak within bound": streamed <= bound,
+        "large recordings kept on disk": not any(large.in_memory),
+        "small recordings kept in memory": all(small.in_memory) or not small_fit,
+        "budget never overdrawn": max(large_reserved, small_reserved) <= budget.limit,
+        "budget fully released": budget.in_use == 0,
+    }
+    print(f"{concurrency} concurrent pipelines, {mb} MiB and {small_kb} KiB recordings")
+    print(f"  buffered peak {buffered:8.1f} MiB  ({buffered / concurrency:.2f} MiB per pipeline)")
+    print(f"  streamed peak {streamed:8.1f} MiB  ({streamed / concurrency:.2f} MiB per pipeline)")
+    print(f"  bound         {bound:8.1f} MiB")
+    print(f"  small in memory {sum(small.in_memory)}/{concurrency}, peak budget {small_reserved / MiB:.1f} MiB")
+    for name, ok in checks.items():
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}")
+    return all(checks.values())
+
+
+async def _wait_for_server() -> None:
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("localhost", PORT)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Stub server did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=int, default=10)
+    parser.add_argument("--small-kb", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    server = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(args.mb * MiB, args.small_kb * 1024), daemon=True,
+    )
+    server.start()
+    try:
+        asyncio.run(_wait_for_server())
+        ok = asyncio.run(check(args.mb, args.small_kb, args.concurrency))
+    finally:
+        server.terminate()
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,71 @@
+"""Assert that odd LLM symptom lists count cleanly into the symptom store.
+
+Over-long, whitespace-only and case/whitespace variants of a symptom are
+applied through ``symptom_service.apply`` inside a transaction that is
+rolled back at the end, so the check never leaves data behind. Exits
+non-zero if the upsert fails or the stored keys and labels are not the
+clipped, normalized forms.
+
+    python -m scripts.check_symptoms
+"""
+
+import asyncio
+import sys
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.models.symptom import Symptom, SymptomDailyCount
+from app.services import symptom_service
+
+MAX = symptom_service.MAX_LENGTH
+LONG = "Starke Kopfschmerzen " * 40  # ~840 characters, as a rambling model answer might be
+SYMPTOMS = [LONG, LONG.upper(), "   ", "\n", "Fieber", " fieber\t"]
+
+
+async def check() -> bool:
+    labels = symptom_service._labels(SYMPTOMS)
+    long_key = symptom_service.normalize(LONG)
+    checks = {
+        "keys and labels fit the columns": all(len(k) <= MAX and len(v) <= MAX for k, v in labels.items()),
+        "variants share one key": sorted(labels) == sorted({long_key, "fieber"}),
+        "label has no trailing space": not labels[long_key].endswith(" "),
+    }
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            db = AsyncSession(bind=conn)
+            day = date.today()
+            try:
+                await symptom_service.apply(db, added=[(day, SYMPTOMS), (day, [LONG])])
+                await db.flush()
+                stored = {
+                    row.key: (row.label, row.call_count, row.daily)
+                    for row in await db.execute(
+                        select(Symptom.key, Symptom.label, Symptom.call_count,
+                               SymptomDailyCount.call_count.label("daily"))
+                        .join(SymptomDailyCount, SymptomDailyCount.symptom_id == Symptom.id)
+                        .where(Symptom.key.in_([long_key, "fieber"]), SymptomDailyCount.day == day)
+                    )
+                }
+                checks["over-long symptom upserted"] = True
+                checks["stored label is the clipped label"] = stored[long_key][0] == labels[long_key]
+                # Two calls mention it, the first one twice
+                checks["counted once per call"] = stored[long_key][1:] == (2, 2)
+            except Exception as exc:
+                print(f"  apply failed: {exc!r}")
+                checks["over-long symptom upserted"] = False
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+    for name, ok in checks.items():
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+    return all(checks.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(check()) else 1)
@@ -0,0 +1,59 @@
+"""Evaluate keyword pre-triage against the labelled seed calls.
+
+Each seed summary, and its symptom list, is classified on its own; a
+"high" label is the positive class. Prints precision and recall plus every
+disagreement, so a pattern change can be judged before it ships. Extra
+hand-written cases cover phrasings summaries rarely use (first person,
+negations).
+
+    python -m scripts.eval_triage
+"""
+
+from app.services import triage_service
+from scripts.seed import SEED_CALLS
+
+# (text, is_high): transcript-style phrasings, including negations that must not flag
+EXTRA_CASES = [
+    ("Ich habe seit einer Stunde so einen Druck auf der Brust.", True),
+    ("Mein Vater bekommt kaum Luft und ist ganz blass.", True),
+    ("Sie ist in der Küche zusammengebrochen und nicht mehr ansprechbar.", True),
+    ("Die Wunde blutet sehr stark, das hört nicht auf.", True),
+    ("Nach dem Wespenstich ist die Zunge angeschwollen.", True),
+    ("Keine Atembeschwerden, nur ein bisschen Halsweh.", False),
+    ("Husten ohne Brustschmerzen, Fieber 38.", False),
+    ("Ich brauche ein neues Rezept für mein Asthmaspray.", False),
+    ("Ich wollte nach meinem Blutbefund fragen.", False),
+]
+
+
+def cases() -> list[tuple[str, str, bool]]:
+    out = []
+    for call in SEED_CALLS:
+        high = call["urgency"] == triage_service.HIGH
+        out.append((call["name"], call["summary"], high))
+        out.append((f"{call['name']} (Symptome)", ", ".join(call["symptoms"]), high))
+    out.extend((f"extra {n}", text, high) for n, (text, high) in enumerate(EXTRA_CASES, 1))
+    return out
+
+
+def evaluate() -> None:
+    tp = fp = fn = tn = 0
+    for label, text, high in cases():
+        result = triage_service.classify(text)
+        flagged = result.urgency == triage_service.HIGH
+        tp += flagged and high
+        fp += flagged and not high
+        fn += high and not flagged
+        tn += not high and not flagged
+        if flagged != high:
+            kind = "false positive" if flagged else "missed high"
+            print(f"{kind:<15} {label}: {text[:80]}  {result.reasons}")
+
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    print(f"{tp + fp + fn + tn} cases: {tp} tp, {fp} fp, {fn} fn, {tn} tn")
+    print(f"precision {precision:.2f}  recall {recall:.2f}")
+
+
+if __name__ == "__main__":
+    evaluate()
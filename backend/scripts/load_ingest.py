@@ -0,0 +1,87 @@
+"""Load-test POST /api/twilio/recording-complete: sustained webhooks per second.
+
+Needs a running server. ``--concurrency`` simulated Twilio senders post
+recording-complete webhooks back to back for ``--seconds``, each with a
+fresh CallSid and no recording (so no processing jobs are queued). Run it
+against a server started with ``INGEST_FLUSHERS=0`` (a commit per webhook)
+and with the default group commit to compare. The calls it created are
+deleted afterwards, through call_service so counters stay correct.
+
+    INGEST_FLUSHERS=0 uvicorn app.main:app --workers 1 &
+    python -m scripts.load_ingest --url http://localhost:8000 --concurrency 200 --seconds 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+from app.database import async_session, engine
+from app.models.call import Call
+from app.services import call_service
+
+SID_PREFIX = "LOADTEST"
+
+
+async def _sender(client: httpx.AsyncClient, url: str, run: str, until: float,
+                  latencies: list[float], errors: list[str]) -> None:
+    while time.perf_counter() < until:
+        form = {
+            "CallSid": f"{SID_PREFIX}-{run}-{uuid.uuid4().hex}",
+            "From": "+43 660 0000000",
+            "RecordingDuration": "42",
+        }
+        started = time.perf_counter()
+        try:
+            response = await client.post(f"{url}/api/twilio/recording-complete", data=form)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            errors.append(repr(exc))
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def _cleanup(run: str) -> int:
+    async with async_session() as db:
+        ids = await call_service.delete_calls(
+            db, [Call.twilio_call_sid.startswith(f"{SID_PREFIX}-{run}-")],
+        )
+    await engine.dispose()
+    return len(ids)
+
+
+async def load(url: str, concurrency: int, seconds: float, cleanup: bool) -> None:
+    run = uuid.uuid4().hex[:8]
+    latencies: list[float] = []
+    errors: list[str] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+        started = time.perf_counter()
+        until = started + seconds
+        await asyncio.gather(*(
+            _sender(client, url, run, until, latencies, errors) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    print(f"{concurrency} senders for {elapsed:.1f} s: {len(latencies)} webhooks, {len(errors)} errors")
+    if latencies:
+        q = statistics.quantiles(latencies, n=100)
+        print(f"  {len(latencies) / elapsed:,.0f} webhooks/s")
+        print(f"  latency p50 {q[49]:.1f} ms, p95 {q[94]:.1f} ms, p99 {q[98]:.1f} ms, max {max(latencies):.1f} ms")
+    if errors:
+        print(f"  first error: {errors[0]}")
+    if cleanup:
+        print(f"  deleted {await _cleanup(run)} load-test calls")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--keep", action="store_true", help="keep the created calls")
+    args = parser.parse_args()
+    asyncio.run(load(args.url, args.concurrency, args.seconds, not args.keep))
@@ -0,0 +1,290 @@
+"""Re-run transcript analysis over stored calls, e.g. after a prompt or model change.
+
+Matching calls are read in keyset pages by id and fanned out to
+``--concurrency`` workers; OpenAI requests go through a token bucket
+(``--rpm``, optionally ``--tpm``) and results are written back in batches of
+``--batch-size``, one transaction each. Analyses are looked up in the
+analysis cache first, so unchanged prompt/model/transcript combinations cost
+nothing. Progress is kept in a checkpoint file holding the highest id below
+which every call is written; rerunning the same command resumes from there.
+Calls whose analysis failed are listed in the checkpoint and retried first
+with ``--retry-failed``. A failed batch write keeps the checkpoint below
+its calls, so the next run picks them up again.
+
+``--stuck`` restricts the run to calls still showing the processing or
+failure placeholder: those with a transcript are re-analyzed, and failed
+recording jobs of those without one are given a fresh set of attempts.
+
+    python -m scripts.reanalyze --concurrency 16 --rpm 500 --tpm 200000
+    python -m scripts.reanalyze --stuck --checkpoint stuck.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from app.database import async_session, engine
+from app.models.call import Call
+from app.services import analysis_cache_service, call_service, clients, job_service, openai_service
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger("reanalyze")
+
+STUCK_SUMMARIES = (call_service.PROCESSING_SUMMARY, call_service.PROCESSING_FAILED_SUMMARY)
+# Rough token estimate for --tpm: ~4 characters per token, plus the JSON answer
+CHARS_PER_TOKEN = 4
+COMPLETION_TOKENS = 200
+
+
+class Checkpoint:
+    def __init__(self, path: Path):
+        self.path = path
+        self.last_id = 0
+        self.processed = 0
+        self.failed_ids: set[int] = set()
+        if path.exists():
+            data = json.loads(path.read_text())
+            self.last_id = data["last_id"]
+            self.processed = data["processed"]
+            self.failed_ids = set(data["failed_ids"])
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({
+            "last_id": self.last_id,
+            "processed": self.processed,
+            "failed_ids": sorted(self.failed_ids),
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+        }))
+        os.replace(tmp, self.path)  # never leave a half-written checkpoint
+
+
+def _conditions(args, after_id: int) -> list:
+    conditions = [Call.id > after_id, Call.transcript.isnot(None), Call.transcript != ""]
+    if args.since:
+        conditions.append(Call.time >= datetime.combine(args.since, datetime.min.time(), timezone.utc))
+    if args.urgency:
+        conditions.append(Call.urgency == args.urgency)
+    if args.stuck:
+        conditions.append(Call.summary.in_(STUCK_SUMMARIES))
+    return conditions
+
+
+async def _requeue_stuck_jobs() -> None:
+    async with async_session() as db:
+        call_ids = list(await db.scalars(
+            select(Call.id).where(Call.summary.in_(STUCK_SUMMARIES), Call.transcript.is_(None))
+        ))
+        requeued = await job_service.retry_failed(db, call_ids)
+    logger.info(
+        "%d stuck calls without transcript, %d failed recording jobs requeued",
+        len(call_ids), len(requeued),
+    )
+
+
+class Reanalyzer:
+    def __init__(self, args, checkpoint: Checkpoint):
+        self.args = args
+        self.checkpoint = checkpoint
+        self.queue: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue(maxsize=args.concurrency * 2)
+        self.requests = TokenBucket(args.rpm / 60, capacity=max(1.0, args.rpm / 60))
+        self.tokens = TokenBucket(args.tpm / 60, capacity=args.tpm / 60) if args.tpm else None
+        self.stopping = asyncio.Event()
+        self.results: list[tuple[int, str, dict]] = []
+        self.flush_lock = asyncio.Lock()
+        # Ids read but not yet written or given up on; the checkpoint stays below them
+        self.pending: set[int] = set()
+        self.max_read = checkpoint.last_id
+        self.done = 0
+        self.model_calls = 0
+        self.failed = 0
+        self.total = 0
+        self.started = time.monotonic()
+
+    async def _produce_failed(self) -> None:
+        """Queue the checkpoint's failed calls again; they leave the list once written."""
+        failed = sorted(self.checkpoint.failed_ids)
+        for start in range(0, len(failed), self.args.page_size):
+            if self.stopping.is_set():
+                return
+            chunk = failed[start:start + self.args.page_size]
+            async with async_session() as db:
+                rows = (await db.execute(
+                    select(Call.id, Call.transcript)
+                    .where(Call.id.in_(chunk), *_conditions(self.args, 0))
+                    .order_by(Call.id)
+                )).all()
+            # Deleted, or no longer matching the filters: nothing left to retry
+            self.checkpoint.failed_ids.difference_update(set(chunk) - {row.id for row in rows})
+            for call_id, transcript in rows:
+                if self.stopping.is_set():
+                    return
+                await self.queue.put((call_id, transcript))
+
+    async def _produce(self) -> None:
+        if self.args.retry_failed:
+            await self._produce_failed()
+        after_id = self.checkpoint.last_id
+        remaining = self.args.limit
+        while not self.stopping.is_set() and remaining != 0:
+            page = self.args.page_size if remaining is None else min(self.args.page_size, remaining)
+            async with async_session() as db:
+                rows = (await db.execute(
+                    select(Call.id, Call.transcript)
+                    .where(*_conditions(self.args, after_id))
+                    .order_by(Call.id)
+                    .limit(page)
+                )).all()
+            if not rows:
+                break
+            for call_id, transcript in rows:
+                if self.stopping.is_set():
+                    return
+                self.pending.add(call_id)
+                self.max_read = call_id
+                await self.queue.put((call_id, transcript))
+            after_id = rows[-1].id
+            if remaining is not None:
+                remaining -= len(rows)
+
+    async def _analyze(self, transcript: str) -> dict | None:
+        await self.requests.acquire()
+        if self.tokens:
+            await self.tokens.acquire(
+                (len(openai_service.ANALYSIS_SYSTEM_PROMPT) + len(transcript)) / CHARS_PER_TOKEN
+                + COMPLETION_TOKENS
+            )
+        self.model_calls += 1
+        return await openai_service.analyze_transcript(transcript)
+
+    async def _work(self) -> None:
+        while (item := await self.queue.get()) is not None:
+            call_id, transcript = item
+            try:
+                analysis = await analysis_cache_service.get_or_compute(
+                    analysis_cache_service.ANALYSIS,
+                    analysis_cache_service.analysis_key(transcript),
+                    lambda: self._analyze(transcript),
+                )
+                if not analysis:
+                    raise RuntimeError("analysis returned no result")
+            except Exception as exc:
+                logger.warning("Call %d failed: %s", call_id, exc)
+                self.failed += 1
+                self.checkpoint.failed_ids.add(call_id)
+                self.pending.discard(call_id)
+                continue
+            self.results.append((call_id, transcript, analysis))
+            if len(self.results) >= self.args.batch_size:
+                await self._flush()
+
+    async def _flush(self) -> None:
+        async with self.flush_lock:
+            batch, self.results = self.results, []
+            written = True
+            if batch and not self.args.dry_run:
+                by_id = {call_id: (transcript, analysis) for call_id, transcript, analysis in batch}
+                try:
+                    async with async_session() as db:
+                        calls = await db.scalars(select(Call).where(Call.id.in_(by_id)))
+                        await call_service.apply_analyses(
+                            db, [(call, *by_id[call.id]) for call in calls],
+                        )
+                except Exception:
+                    # Leave the ids pending, so the checkpoint stays below them
+                    logger.exception("Writing a batch of %d calls failed", len(batch))
+                    self.failed += len(batch)
+                    written = False
+            if written:
+                for call_id, _, _ in batch:
+                    self.pending.discard(call_id)
+                    self.checkpoint.failed_ids.discard(call_id)
+                self.done += len(batch)
+                self.checkpoint.processed += len(batch)
+            self.checkpoint.last_id = min(self.pending) - 1 if self.pending else self.max_read
+            if not self.args.dry_run:
+                self.checkpoint.save()
+
+    def _report(self) -> None:
+        elapsed = time.monotonic() - self.started
+        handled = self.done + self.failed
+        rate = handled / elapsed if elapsed else 0.0
+        left = max(self.total - handled, 0)
+        eta = f"{left / rate / 60:.0f} min" if rate else "-"
+        hit_rate = 1 - self.model_calls / handled if handled else 0.0
+        logger.info(
+            "%d/%d written, %d failed, %.1f calls/s, %.0f%% cache hits, checkpoint id %d, eta %s",
+            self.done, self.total, self.failed, rate, hit_rate * 100, self.checkpoint.last_id, eta,
+        )
+
+    async def _report_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.args.report_seconds)
+            self._report()
+
+    async def run(self) -> None:
+        async with async_session() as db:
+            self.total = await db.scalar(
+                select(func.count()).select_from(Call).where(*_conditions(self.args, self.checkpoint.last_id))
+            )
+        if self.args.limit is not None:
+            self.total = min(self.total, self.args.limit)
+        if self.args.retry_failed:
+            self.total += len(self.checkpoint.failed_ids)
+        logger.info("%d calls to analyze, resuming after id %d", self.total, self.checkpoint.last_id)
+
+        workers = [asyncio.create_task(self._work()) for _ in range(self.args.concurrency)]
+        reporter = asyncio.create_task(self._report_periodically())
+        try:
+            await self._produce()
+        finally:
+            for _ in workers:
+                await self.queue.put(None)
+            await asyncio.gather(*workers)
+            await self._flush()
+            reporter.cancel()
+        self._report()
+
+
+async def main(args) -> None:
+    checkpoint = Checkpoint(Path(args.checkpoint))
+    reanalyzer = Reanalyzer(args, checkpoint)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Stop reading; queued calls still finish and the checkpoint is saved
+        loop.add_signal_handler(sig, reanalyzer.stopping.set)
+    try:
+        if args.stuck and not args.dry_run:
+            await _requeue_stuck_jobs()
+        await reanalyzer.run()
+    finally:
+        await clients.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checkpoint", default="reanalyze.checkpoint.json")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rpm", type=float, default=300, help="OpenAI requests per minute")
+    parser.add_argument("--tpm", type=float, default=0, help="estimated OpenAI tokens per minute (0 = no limit)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--since", type=date.fromisoformat, help="only calls on or after this day (YYYY-MM-DD)")
+    parser.add_argument("--urgency", choices=("high", "medium", "low"))
+    parser.add_argument("--retry-failed", action="store_true", help="first retry the checkpoint's failed calls")
+    parser.add_argument("--stuck", action="store_true", help="only calls stuck in processing or failed")
+    parser.add_argument("--report-seconds", type=float, default=10.0)
+    parser.add_argument("--dry-run", action="store_true", help="analyze (and fill the cache) but write no calls and no checkpoint")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(args))
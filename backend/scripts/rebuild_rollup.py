@@ -0,0 +1,19 @@
+"""Backfill or rebuild calls_daily_rollup from the calls table."""
+
+import asyncio
+
+from app.database import async_session, engine
+from app.services import cache_service, rollup_service
+
+
+async def rebuild():
+    async with async_session() as session:
+        rows = await rollup_service.rebuild(session)
+        await cache_service.next_version(session)
+        await session.commit()
+        print(f"Rebuilt calls_daily_rollup ({rows} rows).")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
@@ -0,0 +1,19 @@
+"""Backfill or rebuild the symptom dictionary counters from the calls table."""
+
+import asyncio
+
+from app.database import async_session, engine
+from app.services import cache_service, symptom_service
+
+
+async def rebuild():
+    async with async_session() as session:
+        calls = await symptom_service.rebuild(session)
+        await cache_service.next_version(session)
+        await session.commit()
+        print(f"Rebuilt symptom counters from {calls} calls.")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild())
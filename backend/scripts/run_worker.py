@@ -0,0 +1,45 @@
+"""Run recording-job workers outside the API process.
+
+Start as many of these as needed, on any host that reaches the database;
+jobs are claimed with SKIP LOCKED, so workers never collide. Set
+RECORDING_WORKERS=0 on the API to leave all processing to them.
+
+    python -m scripts.run_worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.config import settings
+from app.database import engine
+from app.services import clients, job_service, notify_service, recording_service
+
+
+async def main(concurrency: int) -> None:
+    if settings.pg_notify_enabled:
+        notify_service.listen(job_service.JOBS_CHANNEL, lambda _payload: job_service.wake())
+        await notify_service.start()
+    recording_service.start(concurrency)
+    logging.info("Running %d recording workers", concurrency)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    logging.info("Stopping; in-flight jobs are released to other workers")
+    await recording_service.stop()
+    await notify_service.stop()
+    await clients.close()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(args.concurrency))
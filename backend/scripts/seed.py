@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import async_session, engine
 from app.models.call import Base, Call
+from app.services import cache_service, rollup_service, symptom_service
 
 
 def _dt(day_offset: int, time_str: str) -> datetime:
@@ -203,6 +204,10 @@ async def seed():
             )
             session.add(call)
 
+        await session.flush()
+        await rollup_service.rebuild(session)
+        await symptom_service.rebuild(session)
+        await cache_service.next_version(session)
         await session.commit()
         print(f"Seeded {len(SEED_CALLS)} calls.")
 